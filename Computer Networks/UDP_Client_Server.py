@@ -1,65 +1,862 @@
 #!/usr/bin/env python3
 
+import array
+import asyncio
+import collections
+import ctypes
+import functools
+import heapq
+import itertools
+import multiprocessing
+import os
+import random
 import socket
+import struct
+import sys
+import time
+import zlib
 
-SECRET_WORD = "banana"
+WORD_LENGTH = 6
 
+# Secrets when no word list is loaded; all WORD_LENGTH letters so the
+# client's "N letter word" hint stays right
+WORDS = [
+    "banana", "orange", "purple", "garden", "rocket", "silver", "planet",
+    "window", "bridge", "castle", "forest", "guitar", "island", "jungle",
+    "kitten", "ladder", "market", "number", "pencil", "rabbit", "summer",
+    "tunnel", "valley", "winter", "yellow", "butter", "candle", "dragon",
+]
+IDLE_TIMEOUT = 300.0
+LOG_INTERVAL = 5.0
+LOG_BACKLOG = 10000
+STATS_INTERVAL = 0.5
+REPLY_TIMEOUT = 5.0
+# Guesses must be in this word list when it exists (one word per line);
+# without it any guess of the right length is accepted
+WORD_LIST = os.environ.get("WORDLE_WORD_LIST", "/usr/share/dict/words")
+# Where the prebuilt word list index is kept; must be writable, or the index
+# is rebuilt from the word list on every start
+INDEX_DIR = os.environ.get("WORDLE_INDEX_DIR", os.path.join(os.path.expanduser("~"), ".cache", "udp-wordle"))
+# Secrets for the multi-session servers. "session": each new game gets its
+# own, reproducible from the day, the client and the table's game count;
+# "daily": everyone gets the same secret for the UTC day, so a player who
+# solves it and plays on gets it again; "random": a random secret per game.
+# The single-game server always uses the daily secret.
+SECRET_ROTATION = os.environ.get("WORDLE_ROTATION", "session")
+# Linux value; older Pythons do not export the constant
+SO_ATTACH_REUSEPORT_CBPF = getattr(socket, "SO_ATTACH_REUSEPORT_CBPF", 51)
 
-def run_server():
+# Optional binary protocol. A request is a 4 byte header (magic, version,
+# kind, word length) followed by the guess in lowercase ASCII. A reply is
+# a fixed 10 byte header (magic, version, status, word length, attempts)
+# followed by a 32 bit field holding 2 bits of status per letter, letter
+# 0 in the lowest bits. Text datagrams never start with the magic byte,
+# so both protocols share one port.
+PROTOCOL_MAGIC = 0xFE
+PROTOCOL_VERSION = 1
+REQUEST_HEADER = struct.Struct("!BBBB")
+REPLY_PACKET = struct.Struct("!BBBBHI")
+KIND_GUESS = 1
+KIND_QUIT = 2
+STATUS_SCORED = 0
+STATUS_SOLVED = 1
+STATUS_BAD_LENGTH = 2
+STATUS_GOODBYE = 3
+STATUS_BAD_REQUEST = 4
+STATUS_NOT_A_WORD = 5
+LETTER_ABSENT = 0
+LETTER_ELSEWHERE = 1
+LETTER_MATCH = 2
+MAX_BINARY_LETTERS = 16
+
+
+def score_guess(text, secret):
+    if len(text) != len(secret):
+        return "Your guess must be " + str(len(secret)) + " letters.", False
+
+    if text == secret:
+        return "You found the word: " + secret.upper(), True
+
+    matches = ""
+    wrong_place = ""
+    for i in range(len(secret)):
+        if text[i] == secret[i]:
+            matches += text[i].upper()
+        else:
+            matches += "_"
+            if text[i] in secret and text[i] not in wrong_place:
+                wrong_place += text[i]
+
+    if wrong_place == "":
+        wrong_place = "none"
+
+    return "Matches: " + matches + " | Wrong place: " + wrong_place, False
+
+
+# Per-secret lookup tables, built once. positions[i][letter] is the
+# already shifted status bits of `letter` at position i, so scoring a guess
+# is one lookup and one OR per letter, with no string building or `in` scans
+class ScoreTable:
+    __slots__ = ("secret", "word", "positions", "solved")
+
+    def __init__(self, secret):
+        self.secret = secret
+        self.word = secret.encode()
+        present = bytearray(256)
+        for letter in self.word:
+            present[letter] = LETTER_ELSEWHERE
+        self.positions = tuple(
+            tuple((LETTER_MATCH if letter == expected else present[letter]) << (2 * i) for letter in range(256))
+            for i, expected in enumerate(self.word)
+        )
+        self.solved = self.score(self.word)
+
+    def score(self, guess, offset=0):
+        bits = 0
+        for table in self.positions:
+            bits |= table[guess[offset]]
+            offset += 1
+        return bits
+
+
+@functools.lru_cache(maxsize=4096)
+def scoring_table(secret):
+    return ScoreTable(secret)
+
+
+# Prebuilt dictionary index, one bucket per word length. A bucket is the
+# sorted words concatenated into one bytes object plus an open addressing
+# hash table (array of word number + 1, 0 for empty, twice as many slots as
+# words) keyed by crc32. A lookup is one crc32 and usually one slice
+# compare, and the whole index loads from disk with a few large reads.
+INDEX_MAGIC = b"WIDX"
+INDEX_VERSION = 2
+# magic, version, word list size, word list mtime, bucket count
+INDEX_HEADER = struct.Struct("<4sBQqI")
+# word length, word count, hash slots
+BUCKET_HEADER = struct.Struct("<BII")
+
+
+class WordBucket:
+    __slots__ = ("length", "words", "slots", "mask")
+
+    def __init__(self, length, words, slots):
+        self.length = length
+        self.words = words
+        self.slots = slots
+        self.mask = len(slots) - 1
+
+    @classmethod
+    def build(cls, length, words):
+        # Word lists are nearly sorted already, which makes this sort cheap
+        words = sorted(words)
+        size = 1
+        while size < 2 * len(words):
+            size *= 2
+        slots = array.array("I", bytes(4 * size))
+        mask = size - 1
+        crc32 = zlib.crc32
+        for number, word in enumerate(words, 1):
+            i = crc32(word) & mask
+            while slots[i]:
+                i = (i + 1) & mask
+            slots[i] = number
+        return cls(length, b"".join(words), slots)
+
+    def __len__(self):
+        return len(self.words) // self.length
+
+    def __getitem__(self, number):
+        if not 0 <= number < len(self):
+            raise IndexError("word number out of range")
+        start = number * self.length
+        return self.words[start:start + self.length].decode()
+
+    def __contains__(self, word):
+        if isinstance(word, str):
+            word = word.encode()
+        length = self.length
+        if len(word) != length:
+            return False
+        words, slots, mask = self.words, self.slots, self.mask
+        i = zlib.crc32(word) & mask
+        while True:
+            number = slots[i]
+            if not number:
+                return False
+            start = (number - 1) * length
+            if words[start:start + length] == word:
+                return True
+            i = (i + 1) & mask
+
+
+class WordIndex:
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self.buckets.values())
+
+    def __contains__(self, word):
+        # WordBucket.__contains__ inlined: this runs for every guess
+        bucket = self.buckets.get(len(word))
+        if bucket is None:
+            return False
+        if isinstance(word, str):
+            word = word.encode()
+        length, words, slots, mask = bucket.length, bucket.words, bucket.slots, bucket.mask
+        i = zlib.crc32(word) & mask
+        while True:
+            number = slots[i]
+            if not number:
+                return False
+            start = (number - 1) * length
+            if words[start:start + length] == word:
+                return True
+            i = (i + 1) & mask
+
+    def words_of_length(self, length):
+        return self.buckets.get(length) or []
+
+    @classmethod
+    def from_words(cls, lines):
+        return cls.from_bytes("\n".join(lines).encode("utf-8", "replace"))
+
+    @classmethod
+    def from_bytes(cls, data):
+        # Plain lowercase ASCII letters only (the bytes methods are ASCII
+        # only), short enough for the binary protocol. Capitalized entries
+        # (names, places, acronyms) are left out, so they are never drawn
+        # as secrets. dict.fromkeys drops duplicates and keeps file order
+        words = dict.fromkeys(
+            word for word in (line.strip() for line in data.split(b"\n"))
+            if 0 < len(word) <= MAX_BINARY_LETTERS and word.isalpha() and word.islower()
+        )
+        by_length = collections.defaultdict(list)
+        for word in words:
+            by_length[len(word)].append(word)
+        return cls({length: WordBucket.build(length, words) for length, words in sorted(by_length.items())})
+
+    @classmethod
+    def load(cls, path=WORD_LIST, index_path=None):
+        # Reuses the prebuilt index while it matches the word list's size and
+        # mtime, otherwise builds it from the text file and saves it
+        stat = os.stat(path)
+        if index_path is None:
+            name = os.path.basename(path) + "-" + format(zlib.crc32(os.path.abspath(path).encode()), "08x") + ".idx"
+            index_path = os.path.join(INDEX_DIR, name)
+        try:
+            return cls.read_index(index_path, stat.st_size, stat.st_mtime_ns)
+        except (OSError, ValueError, struct.error):
+            pass
+
+        with open(path, "rb") as f:
+            index = cls.from_bytes(f.read())
+        try:
+            index.write_index(index_path, stat.st_size, stat.st_mtime_ns)
+        except OSError as e:
+            # Still usable, but every start pays for the build until this is fixed
+            print(f"Could not save the word index ({e}); set WORDLE_INDEX_DIR to a writable directory",
+                  file=sys.stderr)
+        return index
+
+    @classmethod
+    def read_index(cls, index_path, source_size, source_mtime):
+        with open(index_path, "rb") as f:
+            data = f.read()
+        magic, version, size, mtime, count = INDEX_HEADER.unpack_from(data)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            raise ValueError("not a version " + str(INDEX_VERSION) + " word index")
+        if size != source_size or mtime != source_mtime:
+            raise ValueError("word index is out of date")
+
+        buckets = {}
+        offset = INDEX_HEADER.size
+        for _ in range(count):
+            length, words, size = BUCKET_HEADER.unpack_from(data, offset)
+            offset += BUCKET_HEADER.size
+            blob = data[offset:offset + length * words]
+            offset += length * words
+            slots = array.array("I")
+            slots.frombytes(data[offset:offset + 4 * size])
+            offset += 4 * size
+            if len(blob) != length * words or len(slots) != size:
+                raise ValueError("word index is truncated")
+            if sys.byteorder == "big":
+                slots.byteswap()
+            buckets[length] = WordBucket(length, blob, slots)
+        return cls(buckets)
+
+    def write_index(self, index_path, source_size, source_mtime):
+        parts = [INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, source_size, source_mtime, len(self.buckets))]
+        for length, bucket in self.buckets.items():
+            slots = array.array("I", bucket.slots)
+            if sys.byteorder == "big":
+                slots.byteswap()
+            parts += [BUCKET_HEADER.pack(length, len(bucket), len(slots)), bucket.words, slots.tobytes()]
+
+        os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+        # Write then rename, so workers starting together never read half a file
+        temp_path = index_path + "." + str(os.getpid())
+        with open(temp_path, "wb") as f:
+            f.write(b"".join(parts))
+        os.replace(temp_path, index_path)
+
+
+@functools.lru_cache(maxsize=None)
+def load_dictionary(path=WORD_LIST):
+    if not os.path.exists(path):
+        return None
+    return WordIndex.load(path)
+
+
+def secret_words(dictionary):
+    # Every WORD_LENGTH letter word in the list, or the built-in WORDS
+    words = dictionary.words_of_length(WORD_LENGTH) if dictionary is not None else []
+    return words if len(words) else WORDS
+
+
+def utc_day():
+    return time.strftime("%Y-%m-%d", time.gmtime())
+
+
+def pick_secret(words, key):
+    # Same words and key, same secret, in every process and every run
+    return words[zlib.crc32(key.encode()) % len(words)]
+
+
+class Session:
+    __slots__ = ("secret", "scores", "attempts", "last_seen")
+
+    def __init__(self, secret, now):
+        self.secret = secret
+        self.scores = scoring_table(secret)
+        self.attempts = 0
+        self.last_seen = now
+
+
+# One game per client address, dropped after idle_timeout seconds of silence.
+# Idle sessions are found through a heap of deadlines. Entries are not
+# updated when a client sends again; a popped entry whose session was seen
+# recently is pushed back with its new deadline instead, so each datagram
+# costs O(1) and eviction O(log n) per session.
+class SessionTable:
+
+    def __init__(self, words=WORDS, idle_timeout=IDLE_TIMEOUT, dictionary=None, rotation="random"):
+        self.words = words
+        self.idle_timeout = idle_timeout
+        self.dictionary = dictionary
+        self.rotation = rotation
+        self.sessions = {}
+        self.deadlines = []
+        self.counter = itertools.count()
+        self.games = itertools.count(1)
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def get(self, addr, now):
+        session = self.sessions.get(addr)
+        if session is None:
+            session = Session(self.choose_secret(addr), now)
+            self.sessions[addr] = session
+            self._schedule(now + self.idle_timeout, addr, session)
+        session.last_seen = now
+        return session
+
+    def choose_secret(self, addr):
+        if self.rotation == "daily":
+            return pick_secret(self.words, utc_day())
+        if self.rotation == "session":
+            return pick_secret(self.words, utc_day() + " " + str(addr) + " " + str(next(self.games)))
+        return random.choice(self.words)
+
+    def accepts(self, guess, secret):
+        # guess and secret are both str or both bytes
+        return self.dictionary is None or guess == secret or guess in self.dictionary
+
+    def remove(self, addr):
+        # Its heap entry is skipped when it comes up
+        self.sessions.pop(addr, None)
+
+    def evict_idle(self, now):
+        evicted = 0
+        while self.deadlines and self.deadlines[0][0] <= now:
+            _, _, addr, session = heapq.heappop(self.deadlines)
+            if self.sessions.get(addr) is not session:
+                continue
+            deadline = session.last_seen + self.idle_timeout
+            if deadline <= now:
+                del self.sessions[addr]
+                evicted += 1
+            else:
+                self._schedule(deadline, addr, session)
+        return evicted
+
+    def _schedule(self, deadline, addr, session):
+        # The counter keeps sessions themselves out of tuple comparisons
+        heapq.heappush(self.deadlines, (deadline, next(self.counter), addr, session))
+
+
+GOODBYE_PACKET = REPLY_PACKET.pack(PROTOCOL_MAGIC, PROTOCOL_VERSION, STATUS_GOODBYE, 0, 0, 0)
+BAD_REQUEST_PACKET = REPLY_PACKET.pack(PROTOCOL_MAGIC, PROTOCOL_VERSION, STATUS_BAD_REQUEST, 0, 0, 0)
+
+
+def handle_binary(table, data, addr, now):
+    if len(data) < REQUEST_HEADER.size:
+        return BAD_REQUEST_PACKET
+    _, version, kind, length = REQUEST_HEADER.unpack_from(data)
+    if version != PROTOCOL_VERSION:
+        return BAD_REQUEST_PACKET
+
+    if kind == KIND_QUIT:
+        table.remove(addr)
+        return GOODBYE_PACKET
+    if kind != KIND_GUESS or len(data) != REQUEST_HEADER.size + length or length > MAX_BINARY_LETTERS:
+        return BAD_REQUEST_PACKET
+
+    session = table.get(addr, now)
+    scores = session.scores
+    if length != len(scores.word):
+        return REPLY_PACKET.pack(PROTOCOL_MAGIC, PROTOCOL_VERSION, STATUS_BAD_LENGTH,
+                                 len(scores.word), min(session.attempts, 0xFFFF), 0)
+    if not table.accepts(data[REQUEST_HEADER.size:], scores.word):
+        return REPLY_PACKET.pack(PROTOCOL_MAGIC, PROTOCOL_VERSION, STATUS_NOT_A_WORD,
+                                 length, min(session.attempts, 0xFFFF), 0)
+
+    session.attempts += 1
+    bits = scores.score(data, REQUEST_HEADER.size)
+    status = STATUS_SCORED
+    if bits == scores.solved:
+        status = STATUS_SOLVED
+        table.remove(addr)
+    return REPLY_PACKET.pack(PROTOCOL_MAGIC, PROTOCOL_VERSION, status, length, min(session.attempts, 0xFFFF), bits)
+
+
+GUESS_HEADERS = [REQUEST_HEADER.pack(PROTOCOL_MAGIC, PROTOCOL_VERSION, KIND_GUESS, n) for n in range(256)]
+QUIT_PACKET = REQUEST_HEADER.pack(PROTOCOL_MAGIC, PROTOCOL_VERSION, KIND_QUIT, 0)
+
+
+def encode_guess(text):
+    word = text.strip().lower().encode()
+    if len(word) > MAX_BINARY_LETTERS:
+        raise ValueError("guesses are at most " + str(MAX_BINARY_LETTERS) + " letters")
+    return GUESS_HEADERS[len(word)] + word
+
+
+def encode_quit():
+    return QUIT_PACKET
+
+
+@functools.lru_cache(maxsize=4096)
+def _letter_states(bits, length):
+    return tuple((bits >> (2 * i)) & 3 for i in range(length))
+
+
+def decode_reply(data):
+    # Returns (status, word length, attempts, (letter status, ...))
+    magic, version, status, length, attempts, bits = REPLY_PACKET.unpack(data)
+    if magic != PROTOCOL_MAGIC or version != PROTOCOL_VERSION:
+        raise ValueError("not a version " + str(PROTOCOL_VERSION) + " reply")
+    letters = _letter_states(bits, length) if status in (STATUS_SCORED, STATUS_SOLVED) else ()
+    return status, length, attempts, letters
+
+
+def format_reply(guess, reply):
+    # The text protocol's wording, for showing binary replies to a player
+    status, length, attempts, letters = reply
+    guess = guess.strip().lower()
+    if status == STATUS_GOODBYE:
+        return "Goodbye!"
+    if status == STATUS_BAD_LENGTH:
+        return "Your guess must be " + str(length) + " letters."
+    if status == STATUS_NOT_A_WORD:
+        return NOT_A_WORD_REPLY
+    if status == STATUS_SOLVED:
+        return "You found the word: " + guess.upper() + " (" + str(attempts) + " attempts)"
+    if status != STATUS_SCORED:
+        return "The server could not read that guess."
+
+    matches = ""
+    wrong_place = ""
+    for letter, state in zip(guess, letters):
+        matches += letter.upper() if state == LETTER_MATCH else "_"
+        if state == LETTER_ELSEWHERE and letter not in wrong_place:
+            wrong_place += letter
+    return "Matches: " + matches + " | Wrong place: " + (wrong_place or "none")
+
+
+NOT_A_WORD_REPLY = "Not in the word list."
+
+
+def handle_datagram(table, data, addr, now):
+    if data[:1] == b"\xfe":
+        return handle_binary(table, data, addr, now)
+
+    text = data.decode(errors="replace").strip().lower()
+
+    if text == "quit":
+        table.remove(addr)
+        return b"Goodbye!"
+
+    session = table.get(addr, now)
+    if len(text) == len(session.secret):
+        if not table.accepts(text, session.secret):
+            # Not counted as an attempt
+            return NOT_A_WORD_REPLY.encode()
+        session.attempts += 1
+    reply, solved = score_guess(text, session.secret)
+    if solved:
+        # Only this player's game ends; the next datagram starts a new one
+        reply += " (" + str(session.attempts) + " attempts)"
+        table.remove(addr)
+    return reply.encode()
+
+
+def new_session_table(idle_timeout=IDLE_TIMEOUT):
+    # The word list index is loaded once per process and shared by its tables
+    dictionary = load_dictionary()
+    return SessionTable(secret_words(dictionary), idle_timeout, dictionary, SECRET_ROTATION)
+
+
+def run_multi_server(host="127.0.0.1", port=9999, idle_timeout=IDLE_TIMEOUT):
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    sock.bind(("127.0.0.1", 9999))
-    print("Server is running on 127.0.0.1:9999")
-    print("Secret word is ready.")
+    sock.bind((host, port))
+    # Wake up now and then so idle sessions are evicted even without traffic
+    sock.settimeout(1.0)
+    table = new_session_table(idle_timeout)
+    print(f"Multi-session server is running on {host}:{port}")
+    print("Every client plays its own game (" + SECRET_ROTATION + " secrets). Press Ctrl+C to stop.")
 
-    while True:
-        data, addr = sock.recvfrom(1024)
-        text = data.decode().strip().lower()
-        print("Server got:", text, "from", addr)
+    try:
+        while True:
+            try:
+                data, addr = sock.recvfrom(1024)
+            except socket.timeout:
+                table.evict_idle(time.monotonic())
+                continue
+            now = time.monotonic()
+            sock.sendto(handle_datagram(table, data, addr, now), addr)
+            table.evict_idle(now)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sock.close()
+        print(f"Server stopped with {len(table)} open sessions.")
 
-        if text.lower() == "quit":
-            sock.sendto(b"Goodbye!", addr)
-            break
 
-        if len(text) != len(SECRET_WORD):
-            reply = "Your guess must be " + str(len(SECRET_WORD)) + " letters."
-            sock.sendto(reply.encode(), addr)
-            continue
+class GuessServerProtocol(asyncio.DatagramProtocol):
+    # Scores each datagram as it arrives. Logging only appends to a bounded
+    # deque; a background task writes it out in batches, off the event loop
+    def __init__(self, table, log_packets=False):
+        self.table = table
+        self.log_packets = log_packets
+        self.log_lines = collections.deque(maxlen=LOG_BACKLOG)
+        self.packets = 0
+        self.packets_per_second = 0.0
+        self.transport = None
 
-        if text == SECRET_WORD:
-            sock.sendto(("You found the word: " + SECRET_WORD.upper()).encode(), addr)
-            break
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.packets += 1
+        self.transport.sendto(handle_datagram(self.table, data, addr, time.monotonic()), addr)
+        if self.log_packets:
+            self.log_lines.append((addr, data))
+
+    def error_received(self, exc):
+        self.log_lines.append((None, repr(exc).encode()))
 
-        matches = ""
-        wrong_place = ""
-        for i in range(len(SECRET_WORD)):
-            if text[i] == SECRET_WORD[i]:
-                matches += text[i].upper()
+    def stats(self):
+        return {
+            "packets": self.packets,
+            "packets_per_second": self.packets_per_second,
+            "sessions": len(self.table),
+        }
+
+
+def _write_log(text):
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+
+async def _housekeeping(protocol, interval):
+    loop = asyncio.get_running_loop()
+    last_packets, last_time = 0, time.monotonic()
+    while True:
+        await asyncio.sleep(interval)
+        now = time.monotonic()
+        protocol.table.evict_idle(now)
+        protocol.packets_per_second = (protocol.packets - last_packets) / (now - last_time)
+        last_packets, last_time = protocol.packets, now
+
+        lines = []
+        while protocol.log_lines:
+            addr, data = protocol.log_lines.popleft()
+            if addr is None:
+                lines.append("Socket error: " + data.decode() + "\n")
             else:
-                matches += "_"
-                if text[i] in SECRET_WORD and text[i] not in wrong_place:
-                    wrong_place += text[i]
+                lines.append("Server got: " + data.decode(errors="replace").strip().lower() + " from " + str(addr) + "\n")
+        lines.append(f"{protocol.packets_per_second:.0f} packets/s, {len(protocol.table)} sessions\n")
+        # Console writes can block, so they run in a thread
+        await loop.run_in_executor(None, _write_log, "".join(lines))
+
+
+async def serve_async(host="127.0.0.1", port=9999, idle_timeout=IDLE_TIMEOUT,
+                      log_interval=LOG_INTERVAL, log_packets=False):
+    loop = asyncio.get_running_loop()
+    table = new_session_table(idle_timeout)
+    transport, protocol = await loop.create_datagram_endpoint(
+        lambda: GuessServerProtocol(table, log_packets), local_addr=(host, port)
+    )
+    print(f"Async server is running on {host}:{port}")
+    print("Every client plays its own game (" + SECRET_ROTATION + " secrets). Press Ctrl+C to stop.")
+    try:
+        await _housekeeping(protocol, log_interval)
+    finally:
+        transport.close()
+
+
+def run_async_server(host="127.0.0.1", port=9999, idle_timeout=IDLE_TIMEOUT,
+                     log_interval=LOG_INTERVAL, log_packets=False):
+    try:
+        asyncio.run(serve_async(host, port, idle_timeout, log_interval, log_packets))
+    except KeyboardInterrupt:
+        pass
+    print("Server stopped.")
+
+
+# Multi-process mode: every worker binds host:port with SO_REUSEPORT and the
+# kernel spreads datagrams across them. A client is owned by worker
+# (client port % workers). A classic BPF program on the socket group steers
+# each datagram straight to its owner. Where that is unavailable, a worker
+# that receives another worker's client forwards the datagram over a
+# private loopback socket, and the owner replies from the shared port.
+def shard_for(addr, workers):
+    return addr[1] % workers
+
+
+def _encode_forward(addr, data):
+    return socket.inet_aton(addr[0]) + struct.pack("!H", addr[1]) + data
+
+
+def _decode_forward(message):
+    return (socket.inet_ntoa(message[:4]), struct.unpack("!H", message[4:6])[0]), message[6:]
+
+
+class _SockFilter(ctypes.Structure):
+    _fields_ = [("code", ctypes.c_uint16), ("jt", ctypes.c_uint8), ("jf", ctypes.c_uint8), ("k", ctypes.c_uint32)]
 
-        if wrong_place == "":
-            wrong_place = "none"
 
-        reply = "Matches: " + matches + " | Wrong place: " + wrong_place
-        sock.sendto(reply.encode(), addr)
+class _SockFprog(ctypes.Structure):
+    _fields_ = [("len", ctypes.c_uint16), ("filter", ctypes.POINTER(_SockFilter))]
+
+
+def attach_port_steering(sock, workers):
+    # A = UDP source port (IPv4 without options); return A % workers.
+    # The socket index is the order in which the workers joined the group
+    skf_net_off = -0x100000
+    program = (_SockFilter * 3)(
+        _SockFilter(0x28, 0, 0, (skf_net_off + 20) & 0xFFFFFFFF),  # ldh [net + 20]
+        _SockFilter(0x94, 0, 0, workers),  # mod #workers
+        _SockFilter(0x16, 0, 0, 0),  # ret a
+    )
+    fprog = _SockFprog(len(program), program)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, SO_ATTACH_REUSEPORT_CBPF, bytes(fprog))
+        return True
+    except OSError:
+        return False
+
+
+class ShardedServerProtocol(GuessServerProtocol):
+    def __init__(self, table, index, peers):
+        super().__init__(table)
+        self.index = index
+        self.peers = peers
+        self.forwarded = 0
+        self.peer_transport = None
+
+    def datagram_received(self, data, addr):
+        owner = shard_for(addr, len(self.peers))
+        if owner == self.index:
+            super().datagram_received(data, addr)
+        else:
+            self.forwarded += 1
+            self.peer_transport.sendto(_encode_forward(addr, data), self.peers[owner])
+
+
+class PeerProtocol(asyncio.DatagramProtocol):
+    def __init__(self, shard):
+        self.shard = shard
+        self.peers = set(shard.peers)
+
+    def datagram_received(self, message, addr):
+        # The payload names the client to act for, so only trust other workers
+        if addr not in self.peers or len(message) < 6:
+            return
+        client, data = _decode_forward(message)
+        # Reply from the shared port so the client sees the usual server address
+        self.shard.datagram_received(data, client)
+
+
+async def _serve_shard(index, peer_sock, peers, host, port, idle_timeout, counters, ready):
+    loop = asyncio.get_running_loop()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    if index == 0 and len(peers) > 1:
+        attach_port_steering(sock, len(peers))
+
+    table = new_session_table(idle_timeout)
+    _, shard = await loop.create_datagram_endpoint(lambda: ShardedServerProtocol(table, index, peers), sock=sock)
+    shard.peer_transport, _ = await loop.create_datagram_endpoint(lambda: PeerProtocol(shard), sock=peer_sock)
+    ready.set()
+
+    while True:
+        await asyncio.sleep(STATS_INTERVAL)
+        table.evict_idle(time.monotonic())
+        counters[3 * index] = shard.packets
+        counters[3 * index + 1] = shard.forwarded
+        counters[3 * index + 2] = len(table)
+
+
+def _shard_main(index, peer_sock, peers, host, port, idle_timeout, counters, ready):
+    try:
+        asyncio.run(_serve_shard(index, peer_sock, peers, host, port, idle_timeout, counters, ready))
+    except KeyboardInterrupt:
+        pass
+
+
+def start_reuseport_workers(workers, host="127.0.0.1", port=9999, idle_timeout=IDLE_TIMEOUT):
+    if not hasattr(socket, "SO_REUSEPORT"):
+        raise RuntimeError("SO_REUSEPORT is not available on this platform")
+    peer_socks = []
+    for _ in range(workers):
+        peer = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        # Loopback only: forwarded datagrams never leave this host
+        peer.bind(("127.0.0.1", 0))
+        peer_socks.append(peer)
+    peers = [peer.getsockname() for peer in peer_socks]
+    # Build or load the word list index once, before the workers start:
+    # forked workers inherit it, spawned ones find it on disk
+    load_dictionary()
+    # packets, forwarded and sessions per worker, refreshed every STATS_INTERVAL
+    counters = multiprocessing.Array("q", 3 * workers, lock=False)
+
+    processes = []
+    for index in range(workers):
+        ready = multiprocessing.Event()
+        proc = multiprocessing.Process(
+            target=_shard_main,
+            args=(index, peer_socks[index], peers, host, port, idle_timeout, counters, ready),
+            daemon=True,
+        )
+        proc.start()
+        # Start one at a time so worker i is socket i in the reuseport group
+        if not ready.wait(10):
+            for other in processes + [proc]:
+                other.terminate()
+            raise RuntimeError(f"worker {index} did not start")
+        processes.append(proc)
+    for peer in peer_socks:
+        peer.close()
+    return processes, counters
+
+
+def stop_reuseport_workers(processes):
+    for proc in processes:
+        proc.terminate()
+    for proc in processes:
+        proc.join()
+
+
+def run_reuseport_server(workers=None, host="127.0.0.1", port=9999, idle_timeout=IDLE_TIMEOUT):
+    workers = workers or os.cpu_count() or 1
+    processes, counters = start_reuseport_workers(workers, host, port, idle_timeout)
+    print(f"{workers} workers are running on {host}:{port}")
+    print("Every client plays its own game (" + SECRET_ROTATION + " secrets). Press Ctrl+C to stop.")
+    try:
+        for proc in processes:
+            proc.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_reuseport_workers(processes)
+        packets = sum(counters[0::3])
+        forwarded = sum(counters[1::3])
+        print(f"Server stopped after {packets} packets ({forwarded} forwarded between workers).")
+
+
+def run_server():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 9999))
+    dictionary = load_dictionary()
+    secret = pick_secret(secret_words(dictionary), utc_day())
+    print("Server is running on 127.0.0.1:9999")
+    print("Today's secret word is ready.")
+    # One shared game: every client guesses the same secret, text or binary
+    table = SessionTable([secret], dictionary=dictionary)
+
+    while True:
+        data, addr = sock.recvfrom(1024)
+        if data[:1] == b"\xfe":
+            print("Server got a binary request from", addr)
+        else:
+            print("Server got:", data.decode(errors="replace").strip().lower(), "from", addr)
+
+        reply = handle_datagram(table, data, addr, time.monotonic())
+        sock.sendto(reply, addr)
+        if game_over(reply):
+            break
 
     sock.close()
     print("Server stopped.")
 
 
-def run_client():
+def game_over(reply):
+    # A quit or a solved word, in either protocol
+    if reply[:1] == b"\xfe":
+        return len(reply) == REPLY_PACKET.size and reply[2] in (STATUS_SOLVED, STATUS_GOODBYE)
+    return reply == b"Goodbye!" or reply.startswith(b"You found")
+
+
+def run_client(binary=False):
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    # A lost datagram or a stopped server should not hang the prompt
+    sock.settimeout(REPLY_TIMEOUT)
     server = ("127.0.0.1", 9999)
     print("Client is running. Type messages to send.")
-    print(f"Try to guess the {len(SECRET_WORD)} letter word. Type quit to stop.")
+    print(f"Try to guess the {WORD_LENGTH} letter word. Type quit to stop.")
 
     while True:
         message = input("Message (type quit to stop): ")
+        if binary:
+            quitting = message.strip().lower() == "quit"
+            if not quitting and len(message.strip().lower().encode()) > MAX_BINARY_LETTERS:
+                print("Your guess must be " + str(WORD_LENGTH) + " letters.")
+                continue
+            sock.sendto(encode_quit() if quitting else encode_guess(message), server)
+            try:
+                data, _ = sock.recvfrom(1024)
+            except socket.timeout:
+                print("No reply from the server.")
+                continue
+            reply = decode_reply(data)
+            print("Server replied:", format_reply(message, reply))
+            if quitting or reply[0] == STATUS_SOLVED:
+                break
+            continue
+
         sock.sendto(message.encode(), server)
 
-        data, _ = sock.recvfrom(1024)
+        try:
+            data, _ = sock.recvfrom(1024)
+        except socket.timeout:
+            print("No reply from the server.")
+            continue
         print("Server replied:", data.decode())
 
         if message.lower() == "quit":
@@ -73,11 +870,19 @@ def run_client():
 
 
 if __name__ == "__main__":
-    mode = input("Choose mode (server/client): ").strip().lower()
+    mode = input("Choose mode (server/multi/async/workers/client/binary-client): ").strip().lower()
 
     if mode == "server":
         run_server()
+    elif mode == "multi":
+        run_multi_server()
+    elif mode == "async":
+        run_async_server()
+    elif mode == "workers":
+        run_reuseport_server()
     elif mode == "client":
         run_client()
+    elif mode == "binary-client":
+        run_client(binary=True)
     else:
-        print("Unknown mode. Please run again and type server or client.")
+        print("Unknown mode. Please run again and type server, multi, async, workers, client or binary-client.")
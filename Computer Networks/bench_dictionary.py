@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+# Startup and lookup cost of the word list index: building it from the text
+# file, loading the prebuilt index from disk, and a plain set of strings for
+# comparison. Uses a synthetic word list unless one is given.
+#
+#   python bench_dictionary.py [--words 400000] [--word-list PATH]
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from UDP_Client_Server import WordIndex
+
+
+def synthetic_words(count, seed=1):
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(letters) for _ in range(rng.randint(3, 12))))
+    return sorted(words)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def traced(fn):
+    # Separate run, tracemalloc slows down allocation heavy code a lot
+    tracemalloc.start()
+    result = fn()
+    size = tracemalloc.get_traced_memory()[0] / 2**20
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Word list index startup and lookup cost.")
+    parser.add_argument("--words", type=int, default=400000)
+    parser.add_argument("--word-list", help="use this word list instead of a synthetic one")
+    parser.add_argument("--lookups", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.word_list
+        if path is None:
+            path = os.path.join(tmp, "words.txt")
+            with open(path, "w") as f:
+                f.write("\n".join(synthetic_words(args.words)) + "\n")
+        index_path = os.path.join(tmp, "words.idx")
+
+        def load_set():
+            with open(path) as f:
+                return {line.strip().lower() for line in f}
+
+        words, set_time = timed(load_set)
+        _, build_time = timed(lambda: WordIndex.load(path, index_path))
+        index, load_time = timed(lambda: WordIndex.load(path, index_path))
+        set_size = traced(load_set)
+        index_size = traced(lambda: WordIndex.load(path, index_path))
+
+        rng = random.Random(2)
+        probes = rng.sample(sorted(words), min(args.lookups, len(words)))
+        probes += [w + "q" for w in probes]
+
+        def lookups(container):
+            start = time.perf_counter()
+            for word in probes:
+                word in container
+            return (time.perf_counter() - start) / len(probes) * 1e9
+
+        print(f"{len(index)} words, index file {os.path.getsize(index_path) / 2**20:.1f} MiB")
+        print(f"{'structure':<22} {'startup ms':>10} {'MiB':>7} {'lookup ns':>10}")
+        print(f"{'set of str':<22} {set_time * 1e3:10.1f} {set_size:7.1f} {lookups(words):10.0f}")
+        print(f"{'index, first build':<22} {build_time * 1e3:10.1f} {'':>7} {'':>10}")
+        print(f"{'index, prebuilt':<22} {load_time * 1e3:10.1f} {index_size:7.1f} {lookups(index):10.0f}")
+
+
+if __name__ == "__main__":
+    main()
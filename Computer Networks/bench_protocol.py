@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+# Compares the text protocol with the binary one: the cost of one guess
+# round trip's CPU work (client encode, server parse + score + reply,
+# client decode) and the bytes on the wire, without the network.
+#
+#   python bench_protocol.py [--guesses 200000]
+
+import argparse
+import random
+import time
+
+from UDP_Client_Server import (
+    WORDS,
+    SessionTable,
+    decode_reply,
+    encode_guess,
+    handle_datagram,
+    scoring_table,
+    score_guess,
+)
+
+
+def best_of(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Text vs binary guess protocol cost.")
+    parser.add_argument("--guesses", type=int, default=200000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    secret = "garden"
+    # Non-winning guesses, so the session stays put
+    guesses = [w for w in (rng.choice(WORDS) for _ in range(args.guesses)) if w != secret]
+    text_packets = [g.encode() for g in guesses]
+    binary_packets = [encode_guess(g) for g in guesses]
+    table = scoring_table(secret)
+    addr = ("127.0.0.1", 40000)
+
+    def text_score():
+        for g in guesses:
+            score_guess(g, secret)
+
+    def binary_score():
+        for p in binary_packets:
+            table.score(p, 4)
+
+    def text_encode():
+        for g in guesses:
+            g.encode()
+
+    def binary_encode():
+        for g in guesses:
+            encode_guess(g)
+
+    def server(packets):
+        sessions = SessionTable(words=[secret])
+        return lambda: [handle_datagram(sessions, p, addr, 0.0) for p in packets]
+
+    sessions = SessionTable(words=[secret])
+    text_replies = [handle_datagram(sessions, p, addr, 0.0) for p in text_packets]
+    binary_replies = [handle_datagram(sessions, p, addr, 0.0) for p in binary_packets]
+
+    def text_decode():
+        for r in text_replies:
+            r.decode().startswith("You found")
+
+    def binary_decode():
+        for r in binary_replies:
+            decode_reply(r)
+
+    rows = [
+        ("encode guess", text_encode, binary_encode),
+        ("score only", text_score, binary_score),
+        ("server handle", server(text_packets), server(binary_packets)),
+        ("decode reply", text_decode, binary_decode),
+    ]
+    n = len(guesses)
+    print(f"{'step':<14} {'text ns':>9} {'binary ns':>10} {'speedup':>8}")
+    for name, text_fn, binary_fn in rows:
+        t, b = best_of(text_fn) / n * 1e9, best_of(binary_fn) / n * 1e9
+        print(f"{name:<14} {t:9.0f} {b:10.0f} {t / b:7.2f}x")
+
+    text_bytes = (sum(map(len, text_packets)) + sum(map(len, text_replies))) / n
+    binary_bytes = (sum(map(len, binary_packets)) + sum(map(len, binary_replies))) / n
+    print(f"bytes per guess + reply: text {text_bytes:.1f}, binary {binary_bytes:.1f}")
+
+
+if __name__ == "__main__":
+    main()
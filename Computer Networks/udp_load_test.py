@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+# Load generator for the UDP guess server. For each worker count it starts
+# run_reuseport_server's workers, floods them with guesses from several
+# client processes (each with many sockets, i.e. many players), and reports
+# aggregate guesses per second.
+#
+#   python udp_load_test.py --workers 1,2,4 --clients 4 --duration 3
+
+import argparse
+import multiprocessing
+import selectors
+import socket
+import time
+
+from UDP_Client_Server import start_reuseport_workers, stop_reuseport_workers
+
+
+GUESS = b"zzzzzz"
+
+
+def run_clients(host, port, sockets, window, duration, results):
+    server = (host, port)
+    selector = selectors.DefaultSelector()
+    outstanding = {}
+    for _ in range(sockets):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setblocking(False)
+        sock.bind((host, 0))
+        selector.register(sock, selectors.EVENT_READ)
+        outstanding[sock] = 0
+
+    replies = 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        for sock, count in outstanding.items():
+            # Keep `window` guesses in flight per player
+            for _ in range(window - count):
+                try:
+                    sock.sendto(GUESS, server)
+                except BlockingIOError:
+                    break
+                outstanding[sock] += 1
+        events = selector.select(timeout=0.2)
+        if not events:
+            # Lost datagrams: forget them and refill the windows
+            for sock in outstanding:
+                outstanding[sock] = 0
+            continue
+        for key, _ in events:
+            sock = key.fileobj
+            while True:
+                try:
+                    sock.recv(1024)
+                except BlockingIOError:
+                    break
+                replies += 1
+                outstanding[sock] = max(0, outstanding[sock] - 1)
+
+    for sock in outstanding:
+        sock.close()
+    results.put(replies)
+
+
+def measure(workers, args):
+    processes, counters = start_reuseport_workers(workers, args.host, args.port)
+    try:
+        results = multiprocessing.Queue()
+        clients = [
+            multiprocessing.Process(
+                target=run_clients,
+                args=(args.host, args.port, args.sockets, args.window, args.duration, results),
+            )
+            for _ in range(args.clients)
+        ]
+        start = time.monotonic()
+        for proc in clients:
+            proc.start()
+        replies = sum(results.get() for _ in clients)
+        elapsed = time.monotonic() - start
+        for proc in clients:
+            proc.join()
+        # Let the workers publish their final counters
+        time.sleep(0.6)
+        packets = sum(counters[0::3])
+        forwarded = sum(counters[1::3])
+        sessions = sum(counters[2::3])
+    finally:
+        stop_reuseport_workers(processes)
+    return replies / elapsed, packets, forwarded, sessions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure guesses per second against N reuseport workers.")
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated worker counts")
+    parser.add_argument("--clients", type=int, default=4, help="client processes")
+    parser.add_argument("--sockets", type=int, default=64, help="players per client process")
+    parser.add_argument("--window", type=int, default=4, help="guesses in flight per player")
+    parser.add_argument("--duration", type=float, default=3.0, help="seconds per run")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9999)
+    args = parser.parse_args()
+
+    print(f"{'workers':>7} {'guesses/s':>11} {'server pkts':>12} {'forwarded':>10} {'sessions':>9}")
+    for workers in [int(w) for w in args.workers.split(",") if w.strip()]:
+        rate, packets, forwarded, sessions = measure(workers, args)
+        print(f"{workers:>7} {rate:11.0f} {packets:12d} {forwarded:10d} {sessions:9d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Shared helpers for the Harris benchmarks: module loading and test frames."""
+
+import importlib.util
+import os
+import time
+
+import numpy as np
+from PIL import Image
+
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMG_DIR = os.path.join(BASE_DIR, 'project1-images')
+
+
+def load_harris():
+    # harris-corner.py is not an importable module name, so load it by path
+    spec = importlib.util.spec_from_file_location('harris_corner', os.path.join(BASE_DIR, 'harris-corner.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def sudoku_images():
+    return {
+        name: np.array(Image.open(os.path.join(IMG_DIR, name)).convert('L'))
+        for name in ('sudoku1-250.bmp', 'sudoku2-250.bmp')
+    }
+
+
+def synthetic_frame(height, width, cell=40, seed=0):
+    """Checkerboard with noise: plenty of corners at a realistic density."""
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:height, 0:width]
+    board = (((yy // cell) + (xx // cell)) % 2) * 200 + 25
+    noise = rng.normal(0, 8, size=(height, width))
+    return np.clip(board + noise, 0, 255).astype(np.uint8)
+
+
+def best_time(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
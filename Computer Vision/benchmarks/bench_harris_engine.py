@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Benchmark: dense 2D compute_harris_response vs the separable/FFT engine.
+
+    python benchmarks/bench_harris_engine.py [--repeat 3] [--skip-large]
+"""
+
+import argparse
+
+import numpy as np
+from scipy import signal
+
+from _harris import best_time, load_harris, sudoku_images, synthetic_frame
+
+
+def dense_reference(h, im, scale):
+    # compute_harris_response with the scale exposed, for the big-kernel rows
+    imx, imy = h.gauss_derivatives(im, scale)
+    g = h.gauss_kernel(scale)
+    Wxx = signal.convolve(imx*imx, g, mode='same')
+    Wxy = signal.convolve(imx*imy, g, mode='same')
+    Wyy = signal.convolve(imy*imy, g, mode='same')
+    return h.harris_measures(Wxx, Wxy, Wyy)
+
+
+def max_rel_error(a, b):
+    return max(float(np.max(np.abs(x - y)) / (np.max(np.abs(x)) or 1.0)) for x, y in zip(a, b))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--skip-large', action='store_true', help='skip 1080p/4K frames')
+    args = parser.parse_args()
+
+    h = load_harris()
+    frames = dict(sudoku_images())
+    frames['synthetic-720p'] = synthetic_frame(720, 1280)
+    if not args.skip_large:
+        frames['synthetic-1080p'] = synthetic_frame(1080, 1920)
+        frames['synthetic-4k'] = synthetic_frame(2160, 3840)
+
+    print(f"{'image':<18} {'scale':>5} {'dense ms':>10} {'direct ms':>10} {'fft ms':>10} {'speedup':>8} {'max rel err':>12}")
+    for name, im in frames.items():
+        for scale in (3, 40):
+            if scale != 3 and im.size > 1280 * 720:
+                continue  # the dense 2D path takes minutes at this size
+            ref = (h.compute_harris_response(im) if scale == 3 else dense_reference(h, im, scale))
+            dense = best_time(lambda: h.compute_harris_response(im) if scale == 3 else dense_reference(h, im, scale), args.repeat)
+            direct = best_time(lambda: h.compute_harris_response_separable(im, scale=scale, method='direct'), args.repeat)
+            fft = best_time(lambda: h.compute_harris_response_separable(im, scale=scale, method='fft'), args.repeat)
+            auto = h.compute_harris_response_separable(im, scale=scale)
+            err = max_rel_error(ref, auto)
+            print(f"{name:<18} {scale:>5} {dense*1e3:10.1f} {direct*1e3:10.1f} {fft*1e3:10.1f} "
+                  f"{dense/min(direct, fft):7.1f}x {err:12.2e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Benchmark: all three responses in float64 vs only the requested ones in float32.
+
+Reports best-of time and peak memory (numpy allocations, via tracemalloc)
+for each way of getting a Harris response.
+
+    python benchmarks/bench_harris_measures.py [--repeat 3] [--skip-large]
+"""
+
+import argparse
+import tracemalloc
+
+import numpy as np
+
+from _harris import best_time, load_harris, sudoku_images, synthetic_frame
+
+
+def peak_mib(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--skip-large', action='store_true', help='skip 1080p/4K frames')
+    args = parser.parse_args()
+
+    h = load_harris()
+    frames = dict(sudoku_images())
+    frames['synthetic-720p'] = synthetic_frame(720, 1280)
+    if not args.skip_large:
+        frames['synthetic-1080p'] = synthetic_frame(1080, 1920)
+        frames['synthetic-4k'] = synthetic_frame(2160, 3840)
+
+    variants = {
+        'dense f64 R1-R3': lambda im: h.compute_harris_response(im),
+        'separable f64 R1-R3': lambda im: h.compute_harris_response_separable(im),
+        'measures f32 R1-R3': lambda im: h.compute_harris_measures(im, h.HARRIS_MEASURES),
+        'measures f32 R2': lambda im: h.compute_harris_measures(im, 'R2'),
+        'measures f32 R3': lambda im: h.compute_harris_measures(im, 'R3'),
+    }
+
+    print(f"{'image':<18} {'variant':<22} {'ms':>9} {'peak MiB':>9} {'R2 rel err':>11}")
+    for name, im in frames.items():
+        ref = h.compute_harris_response_separable(im)[1]
+        for label, fn in variants.items():
+            if label.startswith('dense') and im.size > 1280 * 720:
+                continue  # minutes per call at this size
+            elapsed = best_time(lambda: fn(im), args.repeat)
+            peak = peak_mib(lambda: fn(im))
+            out = fn(im)
+            r2 = out['R2'] if isinstance(out, dict) and 'R2' in out else (out[1] if isinstance(out, tuple) else None)
+            err = f"{float(np.max(np.abs(r2 - ref)) / np.max(np.abs(ref))):11.2e}" if r2 is not None else f"{'-':>11}"
+            print(f"{name:<18} {label:<22} {elapsed*1e3:9.1f} {peak:9.1f} {err}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Benchmark: multi-scale Harris on a stream of same-shape frames.
+
+Compares a reused MultiScaleHarris (cached kernels, preallocated pyramid
+and workspaces) with building everything per frame, reporting ms/frame and
+the memory newly allocated per frame (numpy allocations, via tracemalloc).
+
+    python benchmarks/bench_harris_multiscale.py [--frames 10] [--levels 3]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from _harris import load_harris, synthetic_frame
+
+
+def per_frame(fn, frames):
+    fn(frames[0])  # warm-up: buffers and kernels for this shape
+    tracemalloc.start()
+    start = time.perf_counter()
+    for frame in frames:
+        fn(frame)
+    elapsed = (time.perf_counter() - start) / len(frames)
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=10)
+    parser.add_argument('--levels', type=int, default=3)
+    args = parser.parse_args()
+
+    h = load_harris()
+    print(f"{'frame':<8} {'variant':<12} {'ms/frame':>9} {'alloc MiB':>10} {'corners':>8}")
+    for name, (height, width) in (('720p', (720, 1280)), ('1080p', (1080, 1920))):
+        frames = [synthetic_frame(height, width, seed=i) for i in range(args.frames)]
+        detector = h.MultiScaleHarris(levels=args.levels)
+        variants = {
+            'reused': lambda f: detector.detect(f, max_points=100),
+            'per-frame': lambda f: h.MultiScaleHarris(levels=args.levels).detect(f, max_points=100),
+        }
+        for label, fn in variants.items():
+            elapsed, peak = per_frame(fn, frames)
+            print(f"{name:<8} {label:<12} {elapsed*1e3:9.1f} {peak:10.1f} {len(fn(frames[0])):8d}")
+
+
+if __name__ == '__main__':
+    main()
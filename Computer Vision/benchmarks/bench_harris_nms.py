@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""Benchmark: loop vs vectorized vs grid corner selection (get_harris_points).
+
+    python benchmarks/bench_harris_nms.py [--repeat 3] [--max-points 100]
+"""
+
+import argparse
+
+from _harris import best_time, load_harris, sudoku_images, synthetic_frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-points', type=int, default=100)
+    parser.add_argument('--min-distance', type=int, default=6)
+    parser.add_argument('--threshold', type=float, default=0.01)
+    args = parser.parse_args()
+
+    h = load_harris()
+    frames = dict(sudoku_images())
+    frames['synthetic-1080p'] = synthetic_frame(1080, 1920)
+    frames['synthetic-4k'] = synthetic_frame(2160, 3840)
+
+    opts = dict(min_distance=args.min_distance, threshold=args.threshold, max_points=args.max_points)
+    print(f"{'image':<18} {'R':<3} {'loop ms':>9} {'vector ms':>10} {'grid ms':>9} {'speedup':>8} {'same':>5}")
+    for name, im in frames.items():
+        responses = h.compute_harris_response_separable(im)
+        for label, resp in zip(('R1', 'R2', 'R3'), responses):
+            loop = best_time(lambda: h.get_harris_points(resp, **opts), args.repeat)
+            vec = best_time(lambda: h.get_harris_points(resp, method='vectorized', **opts), args.repeat)
+            grid = best_time(lambda: h.get_harris_points(resp, method='grid', **opts), args.repeat)
+            same = ([tuple(map(int, p)) for p in h.get_harris_points(resp, **opts)]
+                    == h.get_harris_points(resp, method='vectorized', **opts))
+            print(f"{name:<18} {label:<3} {loop*1e3:9.1f} {vec*1e3:10.1f} {grid*1e3:9.1f} {loop/vec:7.1f}x {str(same):>5}")
+
+
+if __name__ == '__main__':
+    main()
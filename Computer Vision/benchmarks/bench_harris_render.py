@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Benchmark: matplotlib overlay figures vs the NumPy/PIL renderer.
+
+Times writing one corner-overlay PNG per image with each backend. It runs
+headless: matplotlib is forced onto the Agg backend, and the PIL path
+never touches it.
+
+    python benchmarks/bench_harris_render.py [--repeat 3] [--points 100]
+"""
+
+import argparse
+import os
+import tempfile
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+from _harris import best_time, load_harris, sudoku_images, synthetic_frame  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--points', type=int, default=100, help='corners per overlay')
+    args = parser.parse_args()
+
+    h = load_harris()
+    frames = dict(sudoku_images())
+    frames['synthetic-720p'] = synthetic_frame(720, 1280)
+    frames['synthetic-1080p'] = synthetic_frame(1080, 1920)
+
+    print(f"{'image':<18} {'matplotlib ms':>14} {'pil ms':>8} {'speedup':>8} {'mpl KiB':>8} {'pil KiB':>8}")
+    with tempfile.TemporaryDirectory() as out_dir:
+        for name, im in frames.items():
+            resp = h.compute_harris_measures(im, 'R2')['R2']
+            coords = h.get_harris_points(resp, 6, 0.01, args.points, method='vectorized')
+            paths = {b: os.path.join(out_dir, f'{b}.png') for b in ('matplotlib', 'pil')}
+            times = {
+                b: best_time(lambda: h.save_harris_points(im, coords, paths[b], backend=b), args.repeat)
+                for b in paths
+            }
+            sizes = {b: os.path.getsize(p) / 1024 for b, p in paths.items()}
+            print(f"{name:<18} {times['matplotlib']*1e3:14.1f} {times['pil']*1e3:8.1f} "
+                  f"{times['matplotlib']/times['pil']:7.1f}x {sizes['matplotlib']:8.0f} {sizes['pil']:8.0f}")
+
+
+if __name__ == '__main__':
+    main()
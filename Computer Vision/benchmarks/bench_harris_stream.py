@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Benchmark: streaming corner tracking vs re-detecting every frame.
+
+Frames are crops of a textured synthetic scene. The camera is either
+static or panning, and a patch of noise appears for a few frames. The
+script reports sustained fps and how each frame was handled. It also
+checks that the tracked corners moved with the scene.
+
+    python benchmarks/bench_harris_stream.py [--frames 90] [--size 1080p]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from _harris import load_harris, synthetic_frame
+
+
+SIZES = {'720p': (720, 1280), '1080p': (1080, 1920)}
+
+
+def make_scene(height, width, seed=0):
+    rng = np.random.default_rng(seed)
+    board = synthetic_frame(height, width, cell=37, seed=seed).astype(float)
+    blobs = np.kron(rng.normal(0, 30, (height // 10 + 1, width // 10 + 1)), np.ones((10, 10)))
+    return np.clip(board + blobs[:height, :width], 0, 255).astype(np.uint8)
+
+
+def make_frames(count, height, width, motion):
+    dy, dx = motion
+    scene = make_scene(height + abs(dy) * count + 1, width + abs(dx) * count + 1)
+    rng = np.random.default_rng(1)
+    frames = []
+    for i in range(count):
+        frame = scene[i * abs(dy):i * abs(dy) + height, i * abs(dx):i * abs(dx) + width].copy()
+        if count // 3 <= i < count // 3 + 5:  # something new appears for a few frames
+            frame[200:300, 300:420] = rng.integers(0, 255, (100, 120))
+        frames.append(frame)
+    return frames
+
+
+def run_tracker(h, frames, **options):
+    tracker = h.HarrisTracker(**options)
+    kinds, history = {}, []
+    start = time.perf_counter()
+    for points, ids in h.track_harris_corners(frames, tracker):
+        kinds[tracker.last_update] = kinds.get(tracker.last_update, 0) + 1
+        history.append(dict(zip(ids.tolist(), map(tuple, points.tolist()))))
+    return len(frames) / (time.perf_counter() - start), kinds, history
+
+
+def track_accuracy(history, motion, span=10):
+    # scene content moves by -motion per frame; compare positions span frames apart
+    first, last = history[1], history[1 + span]
+    common = [i for i in first if i in last]
+    exact = sum(
+        last[i][0] - first[i][0] == -motion[0] * span and last[i][1] - first[i][1] == -motion[1] * span
+        for i in common
+    )
+    return len(common), len(first), exact
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=90)
+    parser.add_argument('--size', choices=SIZES, default='1080p')
+    parser.add_argument('--redetect-every', type=int, default=15)
+    args = parser.parse_args()
+
+    h = load_harris()
+    height, width = SIZES[args.size]
+    print(f"{'scene':<8} {'mode':<14} {'fps':>7}  {'tracked (exact)':<18} frames by update")
+    for scene, motion in (('static', (0, 0)), ('panning', (1, 2))):
+        frames = make_frames(args.frames, height, width, motion)
+
+        workspace = h.HarrisWorkspace()
+        start = time.perf_counter()
+        for frame in frames[:10]:
+            resp = workspace.measures(frame, 'R2')['R2']
+            h.get_harris_points(resp, 10, 0.1, 200, method='vectorized')
+        print(f"{scene:<8} {'detect always':<14} {10 / (time.perf_counter() - start):7.1f}")
+
+        fps, kinds, history = run_tracker(h, frames, redetect_every=args.redetect_every)
+        common, total, exact = track_accuracy(history, motion)
+        print(f"{scene:<8} {'tracker':<14} {fps:7.1f}  {f'{common}/{total} ({exact})':<18} {kinds}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Benchmark: peak memory and time of full-frame vs tiled Harris on a memmap.
+
+    python benchmarks/bench_harris_tiled.py [--height 6000 --width 8000] [--tile 1024]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from _harris import load_harris, synthetic_frame
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--height', type=int, default=6000)
+    parser.add_argument('--width', type=int, default=8000)
+    parser.add_argument('--tile', type=int, default=1024)
+    parser.add_argument('--max-points', type=int, default=500)
+    parser.add_argument('--skip-full', action='store_true', help='only run the tiled path')
+    args = parser.parse_args()
+
+    h = load_harris()
+    path = os.path.join(tempfile.mkdtemp(), 'frame.npy')
+    np.save(path, synthetic_frame(args.height, args.width))
+    opts = dict(min_distance=10, threshold=0.05, max_points=args.max_points)
+
+    tiled, t_tiled, m_tiled = measure(lambda: h.get_harris_points_tiled(path, 'R2', tile=args.tile, **opts))
+    print(f"tiled ({args.tile}px): {t_tiled:6.2f}s  peak {m_tiled / 2**20:8.1f} MiB  corners {len(tiled)}")
+    if not args.skip_full:
+        def full():
+            im = np.load(path)
+            return h.get_harris_points_fast(h.compute_harris_response_separable(im)[1], **opts)
+        ref, t_full, m_full = measure(full)
+        print(f"full frame    : {t_full:6.2f}s  peak {m_full / 2**20:8.1f} MiB  corners {len(ref)}")
+        print(f"same corners  : {len(set(ref) & set(tiled))}/{len(ref)}")
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
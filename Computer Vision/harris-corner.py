@@ -1,12 +1,24 @@
 from scipy import *  # import SciPy/NumPy for arrays and math
 from scipy import signal  # signal processing tools (convolution)
+from scipy import ndimage  # separable 1D filtering
+from numpy import dtype as numpy_dtype  # normalize dtype arguments for cache keys
+from numpy.lib.stride_tricks import sliding_window_view  # local search windows for tracking
 from PIL import Image  # image I/O
 from pylab import *  # plotting utilities
 import os  # filesystem utilities for saving outputs
+import sys  # command-line arguments
+import glob  # expand image patterns for batch runs
+import time  # per-image timing in batch runs
+import argparse  # batch CLI
+from concurrent.futures import ProcessPoolExecutor  # spread images across cores
 
 
-def main():  # script entry for a quick demo
-  run_demo_and_save()  # run batch over sudoku images and save results
+def main(argv=None):  # script entry: demo without arguments, batch CLI otherwise
+  argv = sys.argv[1:] if argv is None else argv  # command-line arguments
+  if not argv:  # keep the original quick demo
+    run_demo_and_save()  # run batch over sudoku images and save results
+    return
+  return run_batch_cli(argv)  # corner extraction over many images
 
 def gauss_derivative_kernels(size, sizey=None):  # build Gaussian derivative kernels (x and y)
       """ returns x and y derivatives of a 2D
@@ -29,7 +41,7 @@ def gauss_derivatives(im, n, ny=None):  # filter image with Gaussian derivative
         derivative filters of size n. The optional argument
         ny allows for a different size in the y direction."""
 
-    gx,gy = gauss_derivative_kernels(n, sizey=ny)  # build derivative kernels
+    gx,gy = cached_kernels('derivative', n, ny)  # derivative kernels, built once per size
 
     imx = signal.convolve(im,gx, mode='same')  # convolve for Ix
     imy = signal.convolve(im,gy, mode='same')  # convolve for Iy
@@ -45,7 +57,7 @@ def compute_harris_response(image, k=0.05):  # return three response maps: R1, R
     imx,imy = gauss_derivatives(image, 3)  # compute smoothed gradients Ix, Iy
 
     #kernel for blurring
-    gauss = gauss_kernel(3)  # Gaussian window for second-moment tensor
+    gauss = cached_kernels('gauss', 3)  # Gaussian window for second-moment tensor
 
     #compute components of the structure tensor
     Wxx = signal.convolve(imx*imx,gauss, mode='same')  # <Ix^2>
@@ -73,10 +85,257 @@ def compute_harris_response(image, k=0.05):  # return three response maps: R1, R
 
     return R1, R2, R3  # return all three response maps
 
-def get_harris_points(harrisim, min_distance=10, threshold=0.1, max_points=10):  # return up to N strongest corners
+def separable_gauss_derivative_kernels(size, sizey=None):  # 1D factors of gauss_derivative_kernels
+    """ returns (col, row) 1D factor pairs for the x and y derivative
+        kernels, so that outer(col, row) equals gauss_derivative_kernels """
+    size = int(size)  # integer half-size in x
+    sizey = int(sizey) if sizey else size  # same defaulting as the 2D version
+    y = arange(-size, size+1, dtype=float)  # axis 0 coordinates
+    x = arange(-sizey, sizey+1, dtype=float)  # axis 1 coordinates
+    ey = exp(-y**2/float((0.5*sizey)**2))  # gaussian profile along axis 0
+    ex = exp(-x**2/float((0.5*size)**2))  # gaussian profile along axis 1
+    return (ey, -x * ex), (-y * ey, ex)  # (gx factors), (gy factors)
+
+def separable_gauss_kernel(size, sizey=None):  # 1D factors of gauss_kernel
+    """ returns (col, row) so that outer(col, row) equals gauss_kernel """
+    size = int(size)  # integer half-size in x
+    sizey = int(sizey) if sizey else size  # same defaulting as the 2D version
+    gx = exp(-arange(-size, size+1, dtype=float)**2/float(size))  # axis 0 profile
+    gy = exp(-arange(-sizey, sizey+1, dtype=float)**2/float(sizey))  # axis 1 profile
+    return gx / gx.sum(), gy / gy.sum()  # normalizing each factor normalizes the product
+
+_KERNEL_CACHE = {}  # (kind, size, sizey, dtype) -> read-only kernels
+
+def _frozen(kernels, dtype):  # cast (nested tuples of) kernels and make them read-only
+    if isinstance(kernels, tuple):  # pairs of kernels
+        return tuple(_frozen(v, dtype) for v in kernels)
+    kernel = kernels.astype(dtype)  # private copy in the requested dtype
+    kernel.flags.writeable = False  # shared between callers
+    return kernel
+
+def cached_kernels(kind, size, sizey=None, dtype=float64):  # memoized kernel construction
+    """ returns the kernels of the given kind for (size, sizey, dtype),
+        building them once: 'derivative' (gx, gy), 'gauss' (g),
+        'separable_derivative' and 'separable_gauss' (1D factors).
+        the arrays are shared and read-only """
+    size = int(size)  # integer half-size in x
+    sizey = int(sizey) if sizey else size  # same defaulting as the builders
+    key = (kind, size, sizey, numpy_dtype(dtype).str)  # float32 and 'float32' share an entry
+    kernels = _KERNEL_CACHE.get(key)  # built before?
+    if kernels is None:  # first use of this size and dtype
+        builders = {'derivative': gauss_derivative_kernels, 'gauss': gauss_kernel,
+                    'separable_derivative': separable_gauss_derivative_kernels,
+                    'separable_gauss': separable_gauss_kernel}  # kind -> builder
+        kernels = _frozen(builders[kind](size, sizey), dtype)  # build and freeze
+        _KERNEL_CACHE[key] = kernels  # remember
+    return kernels
+
+FFT_MIN_TAPS = 64  # 1D kernel length above which FFT filtering beats direct
+
+def filter_separable(arr, col, row, method='auto', out=None, work=None):  # zero-padded 'same' convolution with outer(col, row)
+    """ convolves the last two axes of arr with the separable kernel
+        outer(col, row), matching signal.convolve(..., mode='same');
+        leading axes (e.g. stacked tensor components) are filtered together.
+        out may be arr itself, so the result overwrites the input; work
+        (shaped like arr) holds the intermediate pass of the direct method """
+    if method == 'auto':  # pick by kernel length
+        method = 'fft' if max(len(col), len(row)) > FFT_MIN_TAPS else 'direct'
+    ax0, ax1 = arr.ndim - 2, arr.ndim - 1  # image axes
+    if method == 'fft':  # FFT along each axis with the 1D factor
+        shape0 = [1] * arr.ndim; shape0[ax0] = len(col)  # broadcastable column kernel
+        shape1 = [1] * arr.ndim; shape1[ax1] = len(row)  # broadcastable row kernel
+        tmp = signal.fftconvolve(arr, col.reshape(shape0), mode='same', axes=ax0)  # filter rows
+        tmp = signal.fftconvolve(tmp, row.reshape(shape1), mode='same', axes=ax1)  # filter cols
+        if out is None:  # new array
+            return tmp
+        out[...] = tmp  # copy into the caller's buffer
+        return out
+    if method != 'direct':  # guard typos
+        raise ValueError(f'unknown filter method: {method}')
+    # even-length kernels need a shifted origin to match the 'same' centering
+    tmp = ndimage.convolve1d(arr, col, axis=ax0, output=work, mode='constant', cval=0.0,
+                             origin=-((len(col)+1) % 2))  # first pass, into work when given
+    return ndimage.convolve1d(tmp, row, axis=ax1, output=out, mode='constant', cval=0.0,
+                              origin=-((len(row)+1) % 2))  # second pass writes straight into out
+
+HARRIS_MEASURES = ('R1', 'R2', 'R3')  # Noble, Harris, Shi-Tomasi
+
+def structure_tensor(image, scale=3, dtype=float64, method='auto', buffers=None):  # stacked <Ix^2>, <Ix Iy>, <Iy^2>
+    """ returns a (3, H, W) array of the blurred structure tensor
+        components, computed in dtype with separable filtering.
+        buffers=(im, work, W) with shapes (H, W), (3, H, W), (3, H, W)
+        makes the whole computation run in preallocated memory """
+    # kernels in the same dtype, otherwise the FFT path promotes to float64
+    (gxc, gxr), (gyc, gyr) = cached_kernels('separable_derivative', scale, dtype=dtype)  # derivative factors
+    gc, gr = cached_kernels('separable_gauss', scale, dtype=dtype)  # window factors
+    if buffers is None:  # allocate as we go
+        im = asarray(image, dtype=dtype)  # convolve1d keeps the input dtype, so convert first
+        work = None  # filter_separable allocates its own intermediate
+        W = empty((3,) + im.shape, dtype=dtype)  # stacked structure tensor products
+        imx = filter_separable(im, gxc, gxr, method)  # Ix
+        imy = filter_separable(im, gyc, gyr, method)  # Iy
+    else:  # caller-owned memory, e.g. a HarrisWorkspace
+        im, work, W = buffers  # input copy, scratch planes, tensor
+        im[...] = image  # convert into the input buffer
+        imx = filter_separable(im, gxc, gxr, method, out=work[1], work=work[0])  # Ix
+        imy = filter_separable(im, gyc, gyr, method, out=work[2], work=work[0])  # Iy
+
+    multiply(imx, imx, out=W[0])  # Ix^2
+    multiply(imx, imy, out=W[1])  # Ix Iy
+    multiply(imy, imy, out=W[2])  # Iy^2
+    del imx, imy  # gradients are not needed for the blur
+    return filter_separable(W, gc, gr, method, out=W, work=work)  # blur all three in one call, in place
+
+def compute_harris_response_separable(image, k=0.05, scale=3, method='auto'):  # fast R1, R2, R3
+    """ same responses as compute_harris_response, using separable 1D
+        (or FFT) filtering and one stacked pass over the tensor components """
+    Wxx, Wxy, Wyy = structure_tensor(image, scale, float64, method)  # tensor components
+    return harris_measures(Wxx, Wxy, Wyy, k)  # R1, R2, R3
+
+def compute_harris_measures(image, measures=('R2',), k=0.05, scale=3, dtype=float32, method='auto'):  # only what is asked for
+    """ returns {label: response} for the requested subset of R1, R2, R3.
+        defaults to float32, and reuses the tensor buffers for the
+        outputs, so one measure costs about half the float64 memory of all three """
+    if isinstance(measures, str):  # a single label
+        measures = (measures,)
+    Wxx, Wxy, Wyy = structure_tensor(image, scale, dtype, method)  # tensor components
+    return dict(zip(measures, harris_measures(Wxx, Wxy, Wyy, k, measures, inplace=True)))  # label -> response
+
+def harris_measures(Wxx, Wxy, Wyy, k=0.05, measures=HARRIS_MEASURES, inplace=False, work=None):  # responses from tensor components
+    """ returns the requested Noble (R1), Harris (R2) and Shi-Tomasi (R3)
+        responses, in the order given. only the requested ones are
+        computed (the sqrt only for R3). inplace=True lets the outputs
+        overwrite the tensor components instead of allocating new arrays;
+        work is an optional stack of scratch planes (trace, then outputs) """
+    unknown = [m for m in measures if m not in HARRIS_MEASURES]  # validate labels
+    if unknown:  # reject typos
+        raise ValueError(f'unknown measures: {", ".join(unknown)}')
+    work = list(work) if work is not None else []  # scratch planes
+    Wtr = add(Wxx, Wyy, out=work.pop(0) if work else None)  # trace of 2x2 matrix
+    Wdet = multiply(Wxx, Wyy, out=Wxx if inplace else None)  # det = Wxx*Wyy - Wxy^2 ...
+    Wdet -= square(Wxy, out=Wxy if inplace else None)  # ... determinant of 2x2 matrix
+    spare = work[::-1] + ([Wyy, Wxy] if inplace else [])  # buffers free for outputs
+
+    out = {}  # label -> response
+    for label in dict.fromkeys(measures):  # each requested measure once
+        buf = spare.pop() if spare else empty_like(Wtr)  # output buffer
+        if label == 'R1':  # Noble measure det / trace
+            add(Wtr, 1e-12, out=buf)  # numerical stability for division
+            divide(Wdet, buf, out=buf)  # det / (trace + eps)
+        elif label == 'R2':  # classic Harris score det - k trace^2
+            square(Wtr, out=buf)  # trace^2
+            buf *= -k  # -k trace^2
+            buf += Wdet  # det - k trace^2
+        else:  # Shi-Tomasi: smaller eigenvalue 0.5 * (trace - sqrt(trace^2 - 4 det))
+            square(Wtr, out=buf)  # trace^2
+            buf *= 0.25  # scaling by powers of two is exact, so this is
+            buf -= Wdet  # disc / 4 = trace^2 / 4 - det without a temporary
+            maximum(buf, 0, out=buf)  # clamp negatives from numerical errors
+            sqrt(buf, out=buf)  # sqrt(disc) / 2
+            buf *= 2.0  # sqrt of discriminant
+            subtract(Wtr, buf, out=buf)  # trace - sqrt(disc)
+            buf *= 0.5  # smaller eigenvalue
+        out[label] = buf  # keep it
+    return tuple(out[label] for label in measures)  # in the requested order
+
+class HarrisWorkspace:  # preallocated buffers for a stream of same-shape frames
+    """ computes Harris responses in memory owned by the workspace, so
+        repeated frames of one shape reuse every buffer and cached kernel.
+        responses returned by measures() are views into the workspace and
+        are overwritten by the next call """
+
+    def __init__(self, scale=3, dtype=float32, method='auto'):  # settings shared by every frame
+        self.scale = scale  # kernel half-size
+        self.dtype = dtype  # working precision
+        self.method = method  # filter_separable method
+        self.shape = None  # frame shape the buffers were made for
+
+    def _ensure(self, shape):  # (re)allocate only when the frame shape changes
+        if shape == self.shape:  # common case for video
+            return
+        self.shape = shape  # new frame size
+        self.im = empty(shape, dtype=self.dtype)  # input copy
+        self.work = empty((3,) + shape, dtype=self.dtype)  # gradients and intermediate passes
+        self.W = empty((3,) + shape, dtype=self.dtype)  # structure tensor, then responses
+
+    def measures(self, image, measures=('R2',), k=0.05):  # like compute_harris_measures, without allocating
+        """ returns {label: response} for image, computed in the workspace """
+        if isinstance(measures, str):  # a single label
+            measures = (measures,)
+        self._ensure(image.shape[:2])  # buffers for this shape
+        Wxx, Wxy, Wyy = structure_tensor(image, self.scale, self.dtype, self.method,
+                                         (self.im, self.work, self.W))  # tensor in place
+        responses = harris_measures(Wxx, Wxy, Wyy, k, measures, inplace=True, work=self.work)  # into the buffers
+        return dict(zip(measures, responses))  # label -> response
+
+class MultiScaleHarris:  # corners at several scales from one Gaussian pyramid
+    """ detects corners on a Gaussian pyramid (each level blurred and
+        subsampled by 2 from the previous one). every level keeps its own
+        pyramid buffer and HarrisWorkspace, so calling detect() on frames
+        of the same shape allocates nothing new """
+
+    def __init__(self, levels=3, scale=3, k=0.05, measure='R2', dtype=float32, method='auto'):  # detector settings
+        self.levels = levels  # pyramid depth, including the full-size image
+        self.scale = scale  # Harris kernel half-size at every level
+        self.k = k  # Harris k value
+        self.measure = measure  # response used for selection
+        self.dtype = dtype  # working precision
+        self.workspaces = [HarrisWorkspace(scale, dtype, method) for _ in range(levels)]  # one per level
+        self.shape = None  # frame shape the pyramid was made for
+
+    def _ensure(self, shape):  # pyramid buffers for this frame shape
+        if shape == self.shape:  # same as the last frame
+            return
+        self.shape = shape  # new frame size
+        self._levels, self._blur = [], []  # level images, anti-alias buffers (unused on the last level)
+        for level in range(self.levels):  # halve each time
+            self._levels.append(empty(shape, dtype=self.dtype))  # image at this level
+            self._blur.append(empty((2,) + shape, dtype=self.dtype))  # first pass, blurred copy
+            shape = ((shape[0] + 1) // 2, (shape[1] + 1) // 2)  # size of [::2, ::2]
+
+    def pyramid(self, image):  # build all levels once for this frame
+        """ returns the list of pyramid levels (views of internal buffers) """
+        self._ensure(image.shape[:2])  # buffers for this shape
+        g = cached_kernels('separable_gauss', 2, dtype=self.dtype)[0]  # sigma 1 anti-alias factor
+        self._levels[0][...] = image  # full resolution
+        for level in range(1, self.levels):  # each level from the previous one
+            work, blur = self._blur[level - 1]  # scratch for the previous level's size
+            filter_separable(self._levels[level - 1], g, g, 'direct', out=blur, work=work)  # anti-alias
+            self._levels[level][...] = blur[::2, ::2]  # subsample
+        return self._levels  # finest first
+
+    def detect(self, image, min_distance=10, threshold=0.1, max_points=10, nms='vectorized'):  # corners with scale
+        """ returns [(row, col, scale), ...] in full-image coordinates,
+            level by level, strongest first within a level. scale is the
+            Harris kernel half-size in full-image pixels (scale * 2**level).
+            min_distance, threshold and max_points apply per level, in level
+            pixels, so coarser levels keep proportionally sparser corners
+            and the border band of the zero-padded filters stays excluded """
+        corners = []  # (row, col, scale)
+        for level, im in enumerate(self.pyramid(image)):  # finest first
+            factor = 2 ** level  # level pixel size in full-image pixels
+            resp = self.workspaces[level].measures(im, self.measure, self.k)[self.measure]  # response at this level
+            for r, c in get_harris_points(resp, min_distance, threshold, max_points, method=nms):  # corners at this level
+                corners.append((r * factor, c * factor, self.scale * factor))  # back to full resolution
+        return corners  # list of (row, col, scale)
+
+def get_harris_points_multiscale(image, levels=3, min_distance=10, threshold=0.1, max_points=10,
+                                 k=0.05, scale=3, measure='R2'):  # one-off multi-scale detection
+    """ corners with their scale over a Gaussian pyramid; keep a
+        MultiScaleHarris around instead when processing many frames """
+    return MultiScaleHarris(levels, scale, k, measure).detect(image, min_distance, threshold, max_points)
+
+def get_harris_points(harrisim, min_distance=10, threshold=0.1, max_points=10, method='loop'):  # return up to N strongest corners
     """ return corners from a Harris response image
         min_distance is the minimum nbr of pixels separating
-        corners and image boundary"""
+        corners and image boundary. method='vectorized' uses
+        get_harris_points_fast, method='grid' get_harris_points_grid"""
+    if method == 'vectorized':  # top-k argpartition + chunked greedy NMS
+        return get_harris_points_fast(harrisim, min_distance, threshold, max_points)
+    if method == 'grid':  # evenly spread corners
+        return get_harris_points_grid(harrisim, min_distance=min_distance, threshold=threshold, max_points=max_points)
+    if method != 'loop':  # guard typos
+        raise ValueError(f'unknown NMS method: {method}')
 
     #find top corner candidates above a threshold
     corner_threshold = max(harrisim.ravel()) * threshold  # relative threshold
@@ -106,6 +365,421 @@ def get_harris_points(harrisim, min_distance=10, threshold=0.1, max_points=10):
                 break  # reached cap
 
     return filtered_coords  # list of (row,col) points
+
+def _harris_candidates(harrisim, min_distance, threshold):  # vectorized candidate extraction
+    """ returns rows, cols, values of pixels above the relative threshold
+        inside the allowed region, exactly as get_harris_points sees them """
+    corner_threshold = harrisim.max() * threshold  # same relative threshold as the loop
+    d = min_distance  # border width
+    inner = harrisim[d:-d, d:-d]  # allowed region (empty for d == 0, like the loop)
+    rows, cols = (inner > corner_threshold).nonzero()  # candidates inside the border
+    rows += d  # back to full-image rows
+    cols += d  # back to full-image cols
+    return rows, cols, harrisim[rows, cols]  # coordinates and scores
+
+NMS_CHUNK = 4096  # candidates pre-filtered per vectorized step
+NMS_TOPK_FACTOR = 64  # argpartition window as a multiple of max_points
+
+def _greedy_select(shape, rows, cols, values, min_distance, max_points, cell=None, per_cell=None):  # best-first NMS
+    """ greedy best-first selection with the loop's [r-d, r+d) x [c-d, c+d)
+        suppression; candidates are ordered by a top-k argpartition and
+        pre-filtered in chunks, so Python only touches live candidates.
+        with cell/per_cell, at most per_cell points are kept per cell id """
+    n = len(values)  # candidate count
+    allowed = ones(shape, dtype=bool)  # suppression mask
+    counts = zeros(int(cell.max()) + 1 if n else 1, dtype=int) if cell is not None else None  # picks per cell
+    d = min_distance  # suppression half-width
+    filtered_coords = []  # selected points
+
+    k = n if max_points is None else min(n, NMS_TOPK_FACTOR * max_points)  # top-k window
+    if k < n:  # partial selection is enough in the common case
+        top = argpartition(-values, k - 1)[:k]  # k strongest, unordered
+        order = top[argsort(-values[top], kind='stable')]  # strongest first
+    else:
+        order = argsort(-values, kind='stable')  # every candidate, strongest first
+    while True:
+        for start in range(0, len(order), NMS_CHUNK):  # walk in chunks
+            idx = order[start:start + NMS_CHUNK]  # next candidates
+            idx = idx[allowed[rows[idx], cols[idx]]]  # drop ones already suppressed
+            if counts is not None:  # grid mode
+                idx = idx[counts[cell[idx]] < per_cell]  # drop ones in full cells
+            for i, r, c in zip(idx.tolist(), rows[idx].tolist(), cols[idx].tolist()):  # live candidates only
+                if not allowed[r, c]:  # suppressed earlier in this chunk
+                    continue
+                if counts is not None:  # grid mode
+                    if counts[cell[i]] >= per_cell:  # cell already full
+                        continue
+                    counts[cell[i]] += 1  # count this pick
+                filtered_coords.append((r, c))  # keep it
+                allowed[r-d:r+d, c-d:c+d] = False  # suppress neighborhood
+                if max_points is not None and len(filtered_coords) >= max_points:  # stop at N
+                    return filtered_coords  # reached cap
+        if k >= n:  # every candidate visited
+            return filtered_coords  # fewer than max_points available
+        rest = ones(n, dtype=bool)  # top-k did not fill the quota
+        rest[top] = False  # skip what was already visited
+        rest = rest.nonzero()[0]  # remaining candidates
+        order = rest[argsort(-values[rest], kind='stable')]  # strongest first
+        k = n  # nothing left after this pass
+
+def get_harris_points_fast(harrisim, min_distance=10, threshold=0.1, max_points=10):  # vectorized NMS
+    """ same result as get_harris_points (relative threshold, border and
+        min_distance suppression, strongest first) without building
+        Python lists of every candidate """
+    rows, cols, values = _harris_candidates(harrisim, min_distance, threshold)  # vectorized candidates
+    return _greedy_select(harrisim.shape, rows, cols, values, min_distance, max_points)  # best-first NMS
+
+def get_harris_points_grid(harrisim, grid=(8, 8), per_cell=1, min_distance=10, threshold=0.1, max_points=None):  # spread corners
+    """ like get_harris_points_fast, but keeps at most per_cell corners in
+        each cell of a (rows, cols) grid over the image, so corners cover
+        the whole frame instead of clustering on high contrast areas """
+    rows, cols, values = _harris_candidates(harrisim, min_distance, threshold)  # vectorized candidates
+    gy, gx = grid  # cells per axis
+    cell = (rows * gy // harrisim.shape[0]) * gx + (cols * gx // harrisim.shape[1])  # cell id per candidate
+    return _greedy_select(harrisim.shape, rows, cols, values, min_distance, max_points, cell, per_cell)  # per-cell NMS
+
+def open_image_source(path):  # array-like view of an image without loading it when possible
+    """ returns a 2D array for path: .npy files are memory-mapped, other
+        formats are decoded by PIL (which loads them fully) """
+    if path.lower().endswith('.npy'):  # raw array on disk
+        return load(path, mmap_mode='r')  # pages are read on demand
+    return array(Image.open(path).convert('L'))  # decoded image
+
+def iter_harris_tiles(source, tile=1024, k=0.05, scale=3, method='auto', measures=HARRIS_MEASURES):  # streamed responses per tile
+    """ yields (r0, c0, R1, R2, R3) for tile-sized blocks of source
+        (any 2D array-like, e.g. a np.memmap), or (r0, c0, *responses)
+        for the given measures. each tile is read with a halo of two
+        kernel radii, so the core matches the full-image responses.
+        every buffer is tile-sized and allocated once, so the responses
+        are views that the next tile overwrites """
+    H, W = source.shape[:2]  # full image size
+    halo = 2 * int(scale)  # derivative radius + window radius
+    (gxc, gxr), (gyc, gyr) = separable_gauss_derivative_kernels(scale)  # derivative factors
+    gc, gr = separable_gauss_kernel(scale)  # window factors
+    size = (tile + 2*halo, tile + 2*halo)  # largest tile plus halo
+    buf = zeros(size)  # reused input buffer (zero outside the image)
+    work_buf = zeros((3,) + size)  # gradients and intermediate passes, like HarrisWorkspace.work
+    tensor_buf = zeros((3,) + size)  # structure tensor, then responses
+    for r0 in range(0, H, tile):  # tile rows
+        for c0 in range(0, W, tile):  # tile cols
+            r1, c1 = min(r0 + tile, H), min(c0 + tile, W)  # core end
+            rr0, cc0 = max(r0 - halo, 0), max(c0 - halo, 0)  # halo start clipped to image
+            rr1, cc1 = min(r1 + halo, H), min(c1 + halo, W)  # halo end clipped to image
+            th, tw = (r1 - r0) + 2*halo, (c1 - c0) + 2*halo  # buffer extent for this tile
+            im = buf[:th, :tw]  # view of the reused buffer
+            im[...] = 0  # zero padding beyond the image, like signal.convolve 'same'
+            oy, ox = rr0 - (r0 - halo), cc0 - (c0 - halo)  # where image data starts in the buffer
+            im[oy:oy + rr1 - rr0, ox:ox + cc1 - cc0] = source[rr0:rr1, cc0:cc1]  # read tile + halo
+            inside = (slice(oy, oy + rr1 - rr0), slice(ox, ox + cc1 - cc0))  # image part of the buffer
+
+            work = work_buf[:, :th, :tw]  # scratch planes for this tile
+            imx = filter_separable(im, gxc, gxr, method, out=work[1], work=work[0])  # Ix
+            imy = filter_separable(im, gyc, gyr, method, out=work[2], work=work[0])  # Iy
+            Wt = tensor_buf[:, :th, :tw]  # products for this tile
+            Wt[...] = 0  # zero outside the image like the full-image blur sees
+            multiply(imx[inside], imx[inside], out=Wt[(0,) + inside])  # Ix^2
+            multiply(imx[inside], imy[inside], out=Wt[(1,) + inside])  # Ix Iy
+            multiply(imy[inside], imy[inside], out=Wt[(2,) + inside])  # Iy^2
+            filter_separable(Wt, gc, gr, method, out=Wt, work=work)  # blur all three together, in place
+            core = (slice(None), slice(halo, halo + r1 - r0), slice(halo, halo + c1 - c0))  # drop the halo
+            Wxx, Wxy, Wyy = Wt[core]  # tensor components for the core
+            yield (r0, c0) + harris_measures(Wxx, Wxy, Wyy, k, measures, inplace=True, work=work[core])  # responses for this tile
+
+def _greedy_select_sparse(rows, cols, values, min_distance, max_points):  # NMS without an image-size mask
+    """ best-first selection with the loop's [r-d, r+d) x [c-d, c+d)
+        suppression, tracking picks in a bucket grid instead of a mask """
+    d = max(min_distance, 1)  # bucket size
+    buckets = {}  # (row bucket, col bucket) -> picks
+    filtered_coords = []  # selected points
+    for i in argsort(-values, kind='stable').tolist():  # strongest first
+        r, c = int(rows[i]), int(cols[i])  # candidate
+        br, bc = r // d, c // d  # its bucket
+        blocked = False  # suppressed by an earlier pick?
+        for nr in (br - 1, br, br + 1):  # neighbouring buckets cover the window
+            for nc in (bc - 1, bc, bc + 1):
+                for qr, qc in buckets.get((nr, nc), ()):  # earlier picks nearby
+                    if qr - min_distance <= r < qr + min_distance and qc - min_distance <= c < qc + min_distance:
+                        blocked = True  # inside a stronger corner's window
+                        break
+                if blocked:
+                    break
+            if blocked:
+                break
+        if blocked:
+            continue
+        filtered_coords.append((r, c))  # keep it
+        buckets.setdefault((br, bc), []).append((r, c))  # remember for later candidates
+        if max_points is not None and len(filtered_coords) >= max_points:  # stop at N
+            break  # reached cap
+    return filtered_coords  # list of (row,col) points
+
+def _seam_chained(shape, rows, cols, d, top, bottom, left, right):  # candidates whose NMS may depend on another tile
+    """ marks candidates linked by a chain of neighbours (at most d apart
+        per axis) to one within d of an interior tile edge; greedy NMS
+        decisions inside an unmarked group depend on that group only """
+    near = zeros(len(rows), dtype=bool)  # within reach of a neighbouring tile
+    if top: near |= rows < d  # tile above
+    if bottom: near |= rows >= shape[0] - d  # tile below
+    if left: near |= cols < d  # tile to the left
+    if right: near |= cols >= shape[1] - d  # tile to the right
+    if not near.any():  # nothing can interact across a seam
+        return near
+    mask = zeros(shape, dtype=bool)  # candidate pixels
+    mask[rows, cols] = True  # mark them
+    half = (d + 1) // 2  # boxes of this half-width overlap for points <= d apart
+    grown = ndimage.maximum_filter(mask, size=2*half + 1)  # one box per candidate
+    labels = ndimage.label(grown, structure=ones((3, 3)))[0]  # chains of neighbouring candidates
+    ids = labels[rows, cols]  # group of each candidate
+    return isin(ids, ids[near])  # every member of a group touching a seam
+
+def get_harris_points_tiled(source, measure='R2', tile=1024, k=0.05, scale=3, min_distance=10,
+                            threshold=0.1, max_points=10, method='auto'):  # corners of very large images
+    """ corners from an image too large for memory (e.g. a np.memmap or
+        an .npy path). responses are computed tile by tile; each tile
+        keeps its best candidates after local NMS, and the survivors are
+        merged with a global, seam-aware NMS. peak memory depends on the
+        tile size, not the image size. candidates chained (within
+        min_distance of each other) to one near an interior tile edge skip
+        the local NMS and go to the merge unfiltered, so suppression chains
+        across seams resolve globally and the corners match
+        get_harris_points on the full response """
+    if isinstance(source, str):  # path to an image or .npy file
+        source = open_image_source(source)  # memory-mapped when possible
+    H, W = source.shape[:2]  # full image size
+    d = min_distance  # border width and suppression half-width
+    global_max = -inf  # maximum response over all tiles
+    kept_rows, kept_cols, kept_values = [], [], []  # per-tile survivors
+
+    for r0, c0, resp in iter_harris_tiles(source, tile, k, scale, method, (measure,)):  # stream tiles, one measure
+        global_max = max(global_max, float(resp.max()))  # running max is a lower bound of the final one
+        # the final threshold is at least this high, so nothing that can survive is lost here
+        rows, cols = (resp > global_max * threshold).nonzero()  # tile candidates (tile coordinates)
+        ok = (rows + r0 >= d) & (rows + r0 < H - d) & (cols + c0 >= d) & (cols + c0 < W - d)  # global border rule
+        rows, cols = rows[ok], cols[ok]  # inside the allowed region
+        values = resp[rows, cols]  # candidate scores
+        seam = _seam_chained(resp.shape, rows, cols, d, r0 > 0, r0 + resp.shape[0] < H, c0 > 0, c0 + resp.shape[1] < W)  # may interact across a seam
+        kept_rows.append(rows[seam] + r0)  # left for the global merge as they are
+        kept_cols.append(cols[seam] + c0)  # full-image cols
+        kept_values.append(values[seam])  # scores
+        rows, cols, values = rows[~seam], cols[~seam], values[~seam]  # decided entirely inside this tile
+        # local NMS on a tile-sized mask, offset by d so windows never wrap
+        picks = _greedy_select((resp.shape[0] + 2*d, resp.shape[1] + 2*d), rows + d, cols + d, values, d, max_points)
+        if picks:  # keep this tile's survivors
+            pr, pc = array(picks, dtype=int64).T - d  # back to tile coordinates
+            kept_rows.append(pr + r0)  # full-image rows
+            kept_cols.append(pc + c0)  # full-image cols
+            kept_values.append(resp[pr, pc])  # scores
+
+    if not kept_values:  # no candidates anywhere
+        return []  # no corners
+    rows, cols, values = concatenate(kept_rows), concatenate(kept_cols), concatenate(kept_values)  # all survivors
+    strong = values > global_max * threshold  # apply the true relative threshold
+    return _greedy_select_sparse(rows[strong], cols[strong], values[strong], d, max_points)  # seam-aware merge
+
+class HarrisTracker:  # corners over a frame stream: detect now and then, track in between
+    """ keeps corners alive across video frames. a full detection runs on
+        the first frame and every redetect_every frames; in between each
+        corner is tracked by an SSD patch search within search_radius
+        pixels. blocks that still differ from the previous frame by more
+        than change_threshold gray levels after compensating the median
+        corner motion (e.g. new objects), and bands of content that
+        entered at the frame edges, are re-detected on their own.
+        all frame-sized buffers are reused """
+
+    def __init__(self, max_points=200, min_distance=10, threshold=0.1, redetect_every=15,
+                 search_radius=6, patch_radius=3, max_error=20.0, change_threshold=12.0, block=64, change_step=4,
+                 k=0.05, scale=3, measure='R2', dtype=float32):  # tracker settings
+        self.max_points = max_points  # corner budget
+        self.min_distance = min_distance  # corner separation and border
+        self.threshold = threshold  # relative to the strongest response of the last full detection
+        self.redetect_every = redetect_every  # frames between full detections
+        self.search_radius = search_radius  # local search half-width in pixels
+        self.patch_radius = patch_radius  # SSD template half-width
+        self.max_error = max_error  # RMS gray-level error above which a track is lost
+        self.change_threshold = change_threshold  # mean abs residual that triggers a block re-detection
+        self.block = block  # change-detection block size
+        self.change_step = change_step  # change detection samples every change_step-th pixel
+        self.k = k  # Harris k value
+        self.measure = measure  # response used for detection
+        self.dtype = dtype  # working precision
+        self.workspace = HarrisWorkspace(scale, dtype, 'direct')  # full-frame detection buffers
+        self.halo = 2 * int(scale) + min_distance  # context around a re-detected block
+        self.shape = None  # frame shape the buffers were made for
+        self.frame_index = 0  # frames seen
+        self.last_update = None  # 'detect', 'partial' or 'track' for the last frame
+        self.points = zeros((0, 2), dtype=int64)  # (N, 2) row, col
+        self.ids = zeros(0, dtype=int64)  # (N,) track ids
+        self._next_id = 0  # next unused track id
+        self._abs_threshold = inf  # absolute response threshold from the last full detection
+        self._shift = (0, 0)  # median corner motion over the last frame
+        self._entered = zeros(4, dtype=int64)  # pixels of new content per edge (top, bottom, left, right)
+        pr = self.patch_radius  # template offsets, built once
+        self._dy, self._dx = mgrid[-pr:pr+1, -pr:pr+1]  # (2P+1, 2P+1) template grid
+        m = pr + self.search_radius  # window half-width around a corner
+        self._wy, self._wx = mgrid[-m:m+1, -m:m+1]  # (2M+1, 2M+1) search window grid
+
+    def _ensure(self, shape):  # frame buffers for this shape
+        if shape == self.shape:  # same as the last frame
+            return
+        self.shape = shape  # new frame size
+        self.gray = empty(shape, dtype=self.dtype)  # current frame
+        self.prev = empty(shape, dtype=self.dtype)  # previous frame, source of the templates
+        self.diff = empty(shape, dtype=self.dtype)  # change-detection scratch
+        self.frame_index = 0  # a new shape starts a new stream
+
+    def _load(self, frame):  # convert the frame into the reused gray buffer
+        self.gray, self.prev = self.prev, self.gray  # last frame becomes the previous one
+        if frame.ndim == 3:  # color: ITU-R 601 luma
+            multiply(frame[..., 0], 0.299, out=self.gray)  # red
+            multiply(frame[..., 1], 0.587, out=self.diff)  # green
+            self.gray += self.diff
+            multiply(frame[..., 2], 0.114, out=self.diff)  # blue
+            self.gray += self.diff
+        else:  # already gray
+            self.gray[...] = frame
+
+    def _assign_ids(self, points, old_points, old_ids, radius=2):  # keep ids of corners found again
+        ids = full(len(points), -1, dtype=int64)  # -1: not matched yet
+        if len(points) and len(old_points):  # match each new corner to the nearest tracked one
+            dist = abs(points[:, None, :] - old_points[None, :, :]).max(axis=2)  # (N, M) chessboard distance
+            nearest = dist.argmin(axis=1)  # closest tracked corner
+            taken = set()  # a track continues in one corner only
+            for i in (dist[arange(len(points)), nearest] <= radius).nonzero()[0].tolist():  # found again, strongest first
+                track = int(old_ids[nearest[i]])  # its id
+                if track not in taken:
+                    ids[i] = track  # inherit
+                    taken.add(track)
+        fresh = ids < 0  # new tracks
+        ids[fresh] = arange(self._next_id, self._next_id + int(fresh.sum()), dtype=int64)  # never reuse ids
+        self._next_id += int(fresh.sum())
+        return ids
+
+    def _detect(self):  # full-frame detection
+        resp = self.workspace.measures(self.gray, self.measure, self.k)[self.measure]  # response in the workspace
+        self._abs_threshold = self.threshold * float(resp.max())  # fixed until the next full detection
+        coords = get_harris_points(resp, self.min_distance, self.threshold, self.max_points, method='vectorized')  # corners
+        points = array(coords, dtype=int64).reshape(-1, 2)  # (N, 2)
+        self.ids = self._assign_ids(points, self.points, self.ids)  # carry ids over
+        self.points = points  # new corner set
+        self._entered = zeros(4, dtype=int64)  # new content per edge since this detection
+
+    def _track(self):  # move every corner to its best match near the old position
+        self._shift = (0, 0)  # no motion known yet
+        if not len(self.points):  # nothing to follow
+            return
+        H, W = self.shape  # frame size
+        m = self.patch_radius + self.search_radius  # window half-width
+        pr, pc = self.points[:, 0], self.points[:, 1]  # current positions
+        inside = (pr >= m) & (pr < H - m) & (pc >= m) & (pc < W - m)  # windows fully inside the frame
+        pr, pc, ids = pr[inside], pc[inside], self.ids[inside]  # drop corners at the edge
+        templates = self.prev[pr[:, None, None] + self._dy, pc[:, None, None] + self._dx]  # (N, 2P+1, 2P+1)
+        windows = self.gray[pr[:, None, None] + self._wy, pc[:, None, None] + self._wx]  # (N, 2M+1, 2M+1)
+        size = 2 * self.patch_radius + 1  # template width
+        views = sliding_window_view(windows, (size, size), axis=(1, 2))  # (N, 2S+1, 2S+1, 2P+1, 2P+1)
+        # SSD = sum(w^2) - 2 sum(w t) + sum(t^2), without a residual per displacement
+        sq = zeros((len(pr),) + tuple(s + 1 for s in windows.shape[1:]))  # integral image of w^2, zero-padded
+        sq[:, 1:, 1:] = (windows * windows).cumsum(axis=1).cumsum(axis=2)
+        energy = sq[:, size:, size:] - sq[:, :-size, size:] - sq[:, size:, :-size] + sq[:, :-size, :-size]  # sum(w^2)
+        cross = einsum('nijkl,nkl->nij', views, templates, optimize=True)  # sum(w t)
+        ssd = energy - 2 * cross + (templates * templates).sum(axis=(1, 2))[:, None, None]  # (N, 2S+1, 2S+1)
+        n, side = len(pr), 2 * self.search_radius + 1  # corners, displacements per axis
+        best = ssd.reshape(n, -1).argmin(axis=1)  # best displacement
+        err = ssd.reshape(n, -1)[arange(n), best] / (size * size)  # mean squared error at the best match
+        ok = err <= self.max_error ** 2  # lost tracks match badly
+        dy, dx = best // side - self.search_radius, best % side - self.search_radius  # displacement
+        self.points = stack([pr + dy, pc + dx], axis=1)[ok]  # moved corners
+        if ok.any():  # global motion estimate for change detection
+            self._shift = (int(median(dy[ok])), int(median(dx[ok])))
+        self.ids = ids[ok]  # their ids
+
+    def _changed_regions(self):  # [(r0, r1, c0, c1), ...] that need a fresh detection
+        H, W = self.shape  # frame size
+        b, step = self.block, self.change_step  # block size, sampling step
+        dy, dx = self._shift  # median motion from prev to gray
+        cur = (slice(max(dy, 0), H + min(dy, 0), step), slice(max(dx, 0), W + min(dx, 0), step))  # sampled part of gray seen in prev
+        old = (slice(max(-dy, 0), H + min(-dy, 0), step), slice(max(-dx, 0), W + min(-dx, 0), step))  # where it was in prev
+        res = self.gray[cur]  # view, to get the sampled shape
+        res = subtract(res, self.prev[old], out=self.diff[:res.shape[0], :res.shape[1]])  # motion-compensated residual
+        absolute(res, out=res)  # magnitude
+        rb = (cur[0].start + arange(res.shape[0]) * step) // b  # block row of every sampled row
+        cb = (cur[1].start + arange(res.shape[1]) * step) // b  # block col of every sampled col
+        rs = flatnonzero(r_[True, rb[1:] != rb[:-1]])  # first sampled row of each block row
+        cs = flatnonzero(r_[True, cb[1:] != cb[:-1]])  # first sampled col of each block col
+        sums = add.reduceat(add.reduceat(res, rs, axis=0), cs, axis=1)  # per-block sums
+        counts = outer(diff(append(rs, len(rb))), diff(append(cs, len(cb))))  # samples per block
+        changed = zeros(((H + b - 1) // b, (W + b - 1) // b), dtype=bool)  # block mask
+        changed[ix_(rb[rs], cb[cs])] = sums / counts > self.change_threshold  # residual too large
+
+        regions = []  # pixel rectangles
+        labels, _ = ndimage.label(changed)  # neighbouring changed blocks form one region
+        for rsl, csl in ndimage.find_objects(labels):  # bounding box of each region, in blocks
+            regions.append((rsl.start * b, min(rsl.stop * b, H), csl.start * b, min(csl.stop * b, W)))  # in pixels
+
+        # content entering at the edges: detect a band once enough of it came in
+        self._entered += (max(dy, 0), max(-dy, 0), max(dx, 0), max(-dx, 0))  # top, bottom, left, right
+        top, bottom, left, right = self._entered.tolist()  # pixels of new content per edge
+        if top >= self.min_distance: regions.append((0, top, 0, W))
+        if bottom >= self.min_distance: regions.append((H - bottom, H, 0, W))
+        if left >= self.min_distance: regions.append((0, H, 0, left))
+        if right >= self.min_distance: regions.append((0, H, W - right, W))
+        self._entered[self._entered >= self.min_distance] = 0  # those bands are covered now
+        return regions  # list of (r0, r1, c0, c1)
+
+    def _redetect_regions(self, regions):  # detection limited to some rectangles
+        H, W = self.shape  # frame size
+        h, d = self.halo, self.min_distance  # context, separation
+        pr, pc = self.points[:, 0], self.points[:, 1]  # tracked corners
+        keep = ones(len(pr), dtype=bool)  # tracks outside every region stay
+        for r0, r1, c0, c1 in regions:
+            keep &= ~((pr >= r0) & (pr < r1) & (pc >= c0) & (pc < c1))
+        rows, cols, values = [pr[keep]], [pc[keep]], [full(int(keep.sum()), inf)]  # tracks win
+        for r0, r1, c0, c1 in regions:  # each region
+            rr0, cc0, rr1, cc1 = max(r0 - h, 0), max(c0 - h, 0), min(r1 + h, H), min(c1 + h, W)  # with context
+            resp = compute_harris_measures(self.gray[rr0:rr1, cc0:cc1], self.measure, self.k,
+                                           self.workspace.scale, self.dtype, 'direct')[self.measure]  # small tile
+            top = float(resp.max())  # strongest response in the tile
+            if top <= self._abs_threshold:  # nothing above the full-frame threshold
+                continue
+            # local NMS with the full-frame threshold; the halo covers the tile border rule
+            coords = get_harris_points(resp, d, self._abs_threshold / top, self.max_points, method='vectorized')
+            pts = array(coords, dtype=int64).reshape(-1, 2) + (rr0, cc0)  # frame coordinates
+            pts = pts[(pts[:, 0] >= r0) & (pts[:, 0] < r1) & (pts[:, 1] >= c0) & (pts[:, 1] < c1)]  # region only
+            rows.append(pts[:, 0]); cols.append(pts[:, 1]); values.append(resp[pts[:, 0] - rr0, pts[:, 1] - cc0])  # new candidates
+        rows, cols, values = concatenate(rows), concatenate(cols), concatenate(values)  # all candidates
+        coords = _greedy_select_sparse(rows, cols, values, d, self.max_points)  # tracks first, then new corners
+        points = array(coords, dtype=int64).reshape(-1, 2)  # (N, 2)
+        self.ids = self._assign_ids(points, self.points[keep], self.ids[keep], radius=0)  # tracks keep their ids
+        self.points = points  # merged corner set
+
+    def update(self, frame):  # process the next frame
+        """ returns (points, ids): (N, 2) row/col corners and their
+            track ids for this frame """
+        self._ensure(frame.shape[:2])  # buffers for this shape
+        self._load(frame)  # into the gray buffer
+        if self.frame_index % self.redetect_every == 0:  # periodic full detection
+            self._detect()
+            self.last_update = 'detect'
+        else:
+            self._track()  # follow existing corners
+            regions = self._changed_regions()  # where the scene changed
+            if sum([(r1 - r0) * (c1 - c0) for r0, r1, c0, c1 in regions]) > 0.5 * self.gray.size:  # most of the frame
+                self._detect()  # cheaper to start over
+                self.last_update = 'detect'
+            elif regions:  # a few regions
+                self._redetect_regions(regions)
+                self.last_update = 'partial'
+            else:
+                self.last_update = 'track'
+        self.frame_index += 1  # frames seen
+        return self.points, self.ids  # corners for this frame
+
+def track_harris_corners(frames, tracker=None, **options):  # streaming mode
+    """ generator over an iterable of frames (2D gray or HxWx3 arrays)
+        yielding (points, ids) per frame; options go to HarrisTracker """
+    tracker = tracker if tracker is not None else HarrisTracker(**options)  # one tracker for the stream
+    for frame in frames:  # e.g. decoded video frames
+        yield tracker.update(frame)  # corners and track ids
+
 def plot_harris_points(image, filtered_coords):  # plot image and overlay corners
     """ plots corners found in image"""
     figure()  # create a new figure
@@ -126,6 +800,54 @@ def plot_harris_points_save(image, filtered_coords, save_path):  # save plot ins
     savefig(save_path, dpi=150)  # save to disk
     close()  # close the figure to free memory
 
+MARKER_COLOR = (31, 119, 180)  # matplotlib's default line color, as in the pylab plots
+
+def _overlay_indices(image, filtered_coords, radius=None, upscale=1):  # palette indices: gray 0..254, markers 255
+    """ contrast-stretches the image like imshow with a gray colormap
+        (to 255 levels) and sets the pixels of a '*'-like marker at every
+        corner to index 255 """
+    im = asarray(image, dtype=float32)  # working copy for the stretch
+    lo, hi = float(im.min()), float(im.max())  # imshow's automatic range
+    idx = ((im - lo) * (254.0 / (hi - lo if hi > lo else 1.0))).astype(uint8)  # 0..254
+    if upscale > 1:  # nearest-neighbour enlargement
+        idx = idx.repeat(upscale, axis=0).repeat(upscale, axis=1)
+    if radius is None:  # visible at any size
+        radius = max(3, min(idx.shape) // 100)
+    pts = array(filtered_coords, dtype=int64).reshape(-1, 2) * upscale + upscale // 2  # marker centres
+    t = arange(-radius, radius + 1)  # offsets along each stroke
+    z = zeros_like(t)
+    dy = concatenate([z, t, t, t])  # horizontal, vertical and both diagonal strokes
+    dx = concatenate([t, z, t, -t])
+    rr = pts[:, :1] + dy  # (N, strokes) rows
+    cc = pts[:, 1:] + dx  # (N, strokes) cols
+    inside = (rr >= 0) & (rr < idx.shape[0]) & (cc >= 0) & (cc < idx.shape[1])  # clip at the edges
+    idx[rr[inside], cc[inside]] = 255  # draw every marker in one assignment
+    return idx  # (H*upscale, W*upscale) uint8
+
+def _overlay_palette(color=MARKER_COLOR):  # gray ramp for indices 0..254, marker color at 255
+    ramp = (arange(255) * 255.0 / 254.0).round().astype(uint8)  # 0..254 -> 0..255
+    return concatenate([repeat(ramp, 3).reshape(-1, 3), array([color], dtype=uint8)])  # (256, 3)
+
+def draw_harris_points(image, filtered_coords, color=MARKER_COLOR, radius=None, upscale=1):  # overlay without matplotlib
+    """ returns an RGB uint8 array of the image (contrast-stretched like
+        imshow with a gray colormap) with a '*'-like marker drawn at every
+        corner; radius defaults to about 1% of the image size. upscale
+        repeats pixels first, which keeps markers readable on small images """
+    return _overlay_palette(color)[_overlay_indices(image, filtered_coords, radius, upscale)]  # RGB image
+
+def save_harris_points(image, filtered_coords, save_path, backend='pil', color=MARKER_COLOR, radius=None, upscale=1):  # fast overlay PNG
+    """ writes the corner overlay to save_path. backend='pil' draws like
+        draw_harris_points and needs no display or figure; backend=
+        'matplotlib' uses plot_harris_points_save as before """
+    if backend == 'matplotlib':  # original figure-based output
+        return plot_harris_points_save(image, filtered_coords, save_path)
+    if backend != 'pil':  # guard typos
+        raise ValueError(f'unknown render backend: {backend}')
+    idx = _overlay_indices(image, filtered_coords, radius, upscale)  # one byte per pixel
+    out = Image.frombytes('P', idx.shape[::-1], idx.tobytes())  # paletted: a third of the RGB data to compress
+    out.putpalette(_overlay_palette(color).ravel().tolist())  # gray ramp + marker color
+    out.save(save_path, compress_level=1)  # fast zlib level; PNG stays lossless
+
 def gauss_kernel(size, sizey = None):  # build normalized 2D Gaussian kernel
     """ Returns a normalized 2D gauss kernel array for convolutions """
     size = int(size)  # integer half-size in x
@@ -137,6 +859,168 @@ def gauss_kernel(size, sizey = None):  # build normalized 2D Gaussian kernel
     g = exp(-(x**2/float(size)+y**2/float(sizey)))  # unnormalized Gaussian
     return g / g.sum()  # normalize so kernel sums to 1
 
+# heuristic starting thresholds per score (tune per image if needed)
+DEFAULT_THRESHOLDS = {
+    'R1': 0.02,
+    'R2': 0.01,
+    'R3': 0.02,
+}
+
+IMAGE_EXTENSIONS = ('.bmp', '.png', '.jpg', '.jpeg', '.tif', '.tiff', '.pgm', '.ppm')  # batch inputs
+
+def collect_images(inputs):  # expand directories, globs and files into a sorted path list
+    """ returns image paths from directories, glob patterns or files """
+    paths = []  # collected image paths
+    for item in inputs:  # each CLI argument
+        if os.path.isdir(item):  # every image in a directory
+            names = sorted(os.listdir(item))  # stable order
+            paths.extend(os.path.join(item, n) for n in names if n.lower().endswith(IMAGE_EXTENSIONS))  # images only
+        elif any(ch in item for ch in '*?['):  # glob pattern
+            paths.extend(sorted(glob.glob(item, recursive=True)))  # expand pattern
+        else:
+            paths.append(item)  # plain file
+    unique, seen = [], set()  # the same file reached through two inputs is processed once
+    for path in paths:  # keep first occurrence
+        if os.path.abspath(path) not in seen:
+            seen.add(os.path.abspath(path))
+            unique.append(path)
+    return unique  # list of image paths
+
+def output_stems(paths):  # unique output names for a batch
+    """ names outputs by each path relative to the inputs' common folder,
+        without the extension, so a/x.bmp and b/x.bmp become a/x and b/x;
+        raises ValueError when two paths still map to one name """
+    full = [os.path.abspath(p) for p in paths]  # resolve relative inputs
+    root = os.path.commonpath([os.path.dirname(p) for p in full]) if full else ''  # shared input folder
+    stems = [os.path.splitext(os.path.relpath(p, root))[0].replace(os.sep, '/') for p in full]  # relative names
+    owners = {}  # stem -> first path using it
+    clashes = []  # paths sharing a stem
+    for path, stem in zip(paths, stems):  # check uniqueness
+        if stem in owners:  # e.g. x.bmp and x.png in one folder
+            clashes.append(f'{owners[stem]} and {path} -> {stem}')
+        owners.setdefault(stem, path)
+    if clashes:  # outputs would overwrite each other
+        raise ValueError('output names collide: ' + '; '.join(clashes))
+    return stems  # one per path, '/' separated
+
+def process_image(img_path, options, stem=None):  # one batch work item; runs in a worker process
+    """ computes the requested responses for one image, selects corners
+        and writes them; returns a small summary plus the corners.
+        stem names the outputs (default: the base filename) and may
+        contain '/' to write into subfolders of the output folder """
+    start = time.perf_counter()  # per-image timing
+    im = array(Image.open(img_path).convert('L'))  # load grayscale as array
+    responses = compute_harris_measures(im, options['measures'], k=options['k'])  # float32, requested maps only
+    stem = stem or os.path.splitext(os.path.basename(img_path))[0]  # output name without extension
+    out_dir = options['out_dir']  # output folder
+    if '/' in stem and (options['format'] != 'npz' or options['plot']):  # per-image files in a subfolder
+        os.makedirs(os.path.dirname(os.path.join(out_dir, stem)), exist_ok=True)  # mirror the input layout
+
+    corners = {}  # label -> ((N, 2) row/col array, (N,) scores)
+    for label in options['measures']:  # each requested score type
+        resp = responses[label]  # response map
+        coords = get_harris_points(resp, min_distance=options['min_distance'], threshold=options['thresholds'][label],
+                                   max_points=options['max_points'], method=options['nms'])  # select corners
+        pts = array(coords, dtype=int32).reshape(-1, 2)  # (N, 2) row, col
+        scores = resp[pts[:, 0], pts[:, 1]].astype(float32)  # score at each corner
+        corners[label] = (pts, scores)  # keep coordinates and scores
+        if options['format'] == 'npy':  # one array file per image and score
+            save(os.path.join(out_dir, f'{stem}_{label}.npy'), pts)  # compact binary
+        if options['plot']:  # optional visualization, off by default
+            save_harris_points(im, coords, os.path.join(out_dir, f'{stem}_{label}.png'), backend=options['plot_backend'])  # overlay
+
+    if options['format'] == 'csv':  # one CSV per image with every score type
+        with open(os.path.join(out_dir, f'{stem}_corners.csv'), 'w') as f:  # write corners
+            f.write('measure,row,col,score\n')  # header
+            for label, (pts, scores) in corners.items():  # each score type
+                for (r, c), v in zip(pts.tolist(), scores.tolist()):  # each corner
+                    f.write(f'{label},{r},{c},{v:.6g}\n')  # one corner per line
+    elapsed = time.perf_counter() - start  # seconds for this image
+    return {'path': img_path, 'stem': stem, 'shape': im.shape, 'seconds': elapsed, 'error': None,
+            'corners': corners if options['format'] == 'npz' else None,
+            'counts': {label: len(pts) for label, (pts, _) in corners.items()}}  # summary
+
+def _process_image_or_error(img_path, options, stem=None):  # batch work item that never raises
+    """ process_image, but a bad file (unreadable, truncated, ...) becomes
+        an error summary instead of ending the whole batch """
+    try:
+        return process_image(img_path, options, stem)  # normal case
+    except Exception as e:  # reported by the caller, batch goes on
+        return {'path': img_path, 'stem': stem, 'shape': None, 'seconds': 0.0, 'error': f'{type(e).__name__}: {e}',
+                'corners': None, 'counts': {}}  # failure summary
+
+def run_batch(paths, options, workers=None, stems=None):  # process images on a process pool
+    """ runs process_image over paths using every core by default;
+        yields summaries as images finish, in input order. an image that
+        fails yields a summary with 'error' set instead of raising """
+    os.makedirs(options['out_dir'], exist_ok=True)  # create outputs directory if not exists
+    stems = stems or [None] * len(paths)  # default: base filenames
+    if workers == 1:  # no pool: easier to debug and profile
+        for path, stem in zip(paths, stems):  # serial run
+            yield _process_image_or_error(path, options, stem)  # one image
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:  # one process per core by default
+        chunk = max(1, len(paths) // (4 * (workers or os.cpu_count() or 1)))  # amortize IPC over many small images
+        yield from pool.map(_process_image_or_error, paths, [options] * len(paths), stems, chunksize=chunk)  # ordered results
+
+def run_batch_cli(argv):  # batch corner extraction command line
+    """ python harris-corner.py <dir|glob|file>... [--out DIR] [--format csv|npy|npz] [--plot [--plot-backend pil|matplotlib]] """
+    parser = argparse.ArgumentParser(description='Batch Harris corner extraction.')  # CLI
+    parser.add_argument('inputs', nargs='+', help='image files, directories or glob patterns')  # images
+    parser.add_argument('--out', default='corners-out', help='output directory')  # output folder
+    parser.add_argument('--format', choices=('csv', 'npy', 'npz'), default='csv',
+                        help='csv/npy: files per image; npz: one corners.npz index')  # output format
+    parser.add_argument('--measures', default='R1,R2,R3', help='comma-separated subset of R1,R2,R3')  # scores
+    parser.add_argument('--min-distance', type=int, default=6)  # corner separation
+    parser.add_argument('--max-points', type=int, default=100)  # corners per score
+    parser.add_argument('--k', type=float, default=0.05, help='Harris k value')  # Harris k
+    parser.add_argument('--threshold', type=float, help='relative threshold for every measure')  # override
+    parser.add_argument('--nms', choices=('loop', 'vectorized', 'grid'), default='vectorized')  # selection method
+    parser.add_argument('--workers', type=int, default=None, help='processes (default: all cores)')  # pool size
+    parser.add_argument('--plot', action='store_true', help='also save PNG overlays')  # off by default
+    parser.add_argument('--plot-backend', choices=('pil', 'matplotlib'), default='pil',
+                        help='overlay renderer; matplotlib is much slower')  # renderer
+    args = parser.parse_args(argv)  # parse
+
+    measures = [m.strip() for m in args.measures.split(',') if m.strip()]  # requested scores
+    unknown = [m for m in measures if m not in DEFAULT_THRESHOLDS]  # validate
+    if unknown:  # reject typos
+        parser.error(f'unknown measures: {", ".join(unknown)}')
+    thresholds = {m: args.threshold if args.threshold is not None else DEFAULT_THRESHOLDS[m] for m in measures}  # per score
+    paths = collect_images(args.inputs)  # expand inputs
+    if not paths:  # nothing to do
+        parser.error('no images found')
+    try:
+        stems = output_stems(paths)  # unique output names relative to the inputs' common folder
+    except ValueError as e:  # would overwrite outputs
+        parser.error(str(e))
+    options = {'out_dir': args.out, 'format': args.format, 'measures': measures, 'thresholds': thresholds,
+               'min_distance': args.min_distance, 'max_points': args.max_points, 'k': args.k,
+               'nms': args.nms, 'plot': args.plot, 'plot_backend': args.plot_backend}  # passed to every worker
+
+    start = time.perf_counter()  # batch timing
+    index = {}  # npz arrays keyed by <stem>/<measure> and <stem>/<measure>_scores
+    done = 0  # finished images
+    failed = []  # (path, error) of images that could not be processed
+    for summary in run_batch(paths, options, args.workers, stems):  # results in input order
+        done += 1  # progress
+        if summary['error'] is not None:  # bad file: note it and keep going
+            failed.append((summary['path'], summary['error']))
+        elif summary['corners'] is not None:  # npz index mode
+            for label, (pts, scores) in summary['corners'].items():  # each score type
+                index[f"{summary['stem']}/{label}"] = pts  # (N, 2) int32 row, col
+                index[f"{summary['stem']}/{label}_scores"] = scores  # (N,) float32
+        if done % 100 == 0 or done == len(paths):  # sparse progress output
+            print(f'{done}/{len(paths)} images ({done / (time.perf_counter() - start):.1f} img/s)')  # log progress
+    if args.format == 'npz':  # single compressed index for the whole batch
+        savez_compressed(os.path.join(args.out, 'corners.npz'), **index)  # one file
+    print(f'Done: {len(paths) - len(failed)}/{len(paths)} images in {time.perf_counter() - start:.1f}s -> {args.out}')  # summary
+    if failed:  # list what was skipped
+        print(f'{len(failed)} failed:')
+        for path, error in failed:  # one line per failed image
+            print(f'  {path}: {error}')
+    return 1 if failed else 0  # exit status
+
 def run_demo_and_save():  # batch run on sudoku images and save figures for R1, R2, R3
     base_dir = os.path.dirname(__file__)  # directory of this script
     img_dir = os.path.join(base_dir, 'project1-images')  # images folder
@@ -145,12 +1029,7 @@ def run_demo_and_save():  # batch run on sudoku images and save figures for R1,
 
     images = ['sudoku1-250.bmp', 'sudoku2-250.bmp']  # demo images
 
-    # heuristic starting thresholds per score (tune per image if needed)
-    thresholds = {
-        'R1': 0.02,
-        'R2': 0.01,
-        'R3': 0.02,
-    }
+    thresholds = DEFAULT_THRESHOLDS  # heuristic starting thresholds per score
 
     min_distance = 6  # enforce spatial separation between corners
     max_points = 100  # allow many points for richer visualization; adjust as needed
@@ -172,4 +1051,4 @@ def run_demo_and_save():  # batch run on sudoku images and save figures for R1,
             print(f'Saved: {save_path} (points={len(coords)}, threshold={thr})')  # log output
  
 if __name__=='__main__':  # run demo if executed as script
-    main()  # call entry point
+    sys.exit(main())  # call entry point; non-zero when batch images failed
@@ -0,0 +1,43 @@
+"""Tiled Harris corners match get_harris_points on the full response."""
+
+import importlib.util
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _load_harris():
+    # harris-corner.py is not an importable module name, so load it by path
+    spec = importlib.util.spec_from_file_location('harris_corner', os.path.join(BASE_DIR, 'harris-corner.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+h = _load_harris()
+
+
+def _image(name):
+    if name == 'checkerboard':
+        rng = np.random.default_rng(0)
+        yy, xx = np.mgrid[0:300, 0:420]
+        board = (((yy // 23) + (xx // 23)) % 2) * 200 + 25
+        return np.clip(board + rng.normal(0, 8, board.shape), 0, 255).astype(np.uint8)
+    return np.array(Image.open(os.path.join(BASE_DIR, 'project1-images', name)).convert('L'))
+
+
+@pytest.mark.parametrize('name', ['sudoku1-250.bmp', 'sudoku2-250.bmp', 'checkerboard'])
+@pytest.mark.parametrize('measure', ['R1', 'R2', 'R3'])
+def test_tiled_matches_full_response(name, measure):
+    im = _image(name)
+    resp = dict(zip(('R1', 'R2', 'R3'), h.compute_harris_response_separable(im)))[measure]
+    for max_points in (None, 40):
+        ref = set(h.get_harris_points(resp, 10, 0.1, max_points))
+        for tile in (32, 50, 64, 100, 128, 1024):
+            got = h.get_harris_points_tiled(im.astype(float), measure, tile=tile, max_points=max_points)
+            assert set(got) == ref, (tile, max_points)
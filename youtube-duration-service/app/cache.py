@@ -0,0 +1,223 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from .shared import shared_cache_path
+
+
+class TTLCache:
+    """In-memory LRU cache whose entries expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, allow_expired: bool = False) -> Optional[Dict]:
+        # Expired entries stay until LRU eviction so they can be served stale
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic() and not allow_expired:
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Dict, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCache:
+    """On-disk cache tier backed by a single SQLite table; survives restarts.
+
+    Expired rows are kept for `stale_grace` more seconds so they can be
+    served stale, then deleted by a prune that runs from set() at most
+    every `prune_interval` seconds.
+    """
+
+    def __init__(self, path: str, ttl: float = 86400.0, stale_grace: float = 86400.0,
+                 prune_interval: float = 300.0):
+        self.path = path
+        self.ttl = ttl
+        self.stale_grace = stale_grace
+        self.prune_interval = prune_interval
+        self._last_prune = 0.0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        # WAL lets several worker processes read while one writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS durations ("
+            " id TEXT PRIMARY KEY,"
+            " payload TEXT NOT NULL,"
+            " expires_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS durations_expires_at ON durations (expires_at)")
+        self._conn.commit()
+
+    def get(self, key: str, allow_expired: bool = False) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, expires_at FROM durations WHERE id = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        payload, expires_at = row
+        if expires_at <= time.time() and not allow_expired:
+            return None
+        return json.loads(payload)
+
+    def set(self, key: str, value: Dict, ttl: Optional[float] = None) -> None:
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO durations (id, payload, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at),
+            )
+            if now - self._last_prune >= self.prune_interval:
+                self._prune(now)
+            self._conn.commit()
+
+    def prune(self) -> int:
+        """Delete rows expired for longer than the stale grace; returns how many."""
+        with self._lock:
+            deleted = self._prune(time.time())
+            self._conn.commit()
+        return deleted
+
+    def _prune(self, now: float) -> int:
+        self._last_prune = now
+        cursor = self._conn.execute("DELETE FROM durations WHERE expires_at < ?", (now - self.stale_grace,))
+        return cursor.rowcount
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM durations WHERE id = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM durations")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class DurationCache:
+    """Two-tier cache (memory, then optional disk) keyed on the video ID."""
+
+    def __init__(self, memory: TTLCache, disk: Optional[SQLiteCache] = None):
+        self.memory = memory
+        self.disk = disk
+        self.hits = 0
+        self.misses = 0
+        # Misses answered by another worker's extraction via the shared store
+        self.shared_hits = 0
+        self._stats_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict]:
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                # Promote disk hits so the next lookup stays in memory
+                self.memory.set(key, value)
+        with self._stats_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def get_shared(self, key: str) -> Optional[Dict]:
+        # Re-read the disk tier only, which other worker processes also write
+        if self.disk is None:
+            return None
+        value = self.disk.get(key)
+        if value is not None:
+            self.memory.set(key, value)
+            with self._stats_lock:
+                self.shared_hits += 1
+        return value
+
+    def get_stale(self, key: str) -> Optional[Dict]:
+        # Last known value regardless of TTL; not counted as a hit or miss
+        value = self.memory.get(key, allow_expired=True)
+        if value is None and self.disk is not None:
+            value = self.disk.get(key, allow_expired=True)
+        return value
+
+    def set(self, key: str, value: Dict) -> None:
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def invalidate(self, key: str) -> None:
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+        with self._stats_lock:
+            self.hits = 0
+            self.misses = 0
+            self.shared_hits = 0
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            hits, misses, shared_hits = self.hits, self.misses, self.shared_hits
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'shared_hits': shared_hits,
+            'hit_ratio': (hits / total) if total else 0.0,
+            'memory_entries': len(self.memory),
+            'disk_enabled': self.disk is not None,
+        }
+
+
+def build_cache_from_env() -> DurationCache:
+    # DURATION_CACHE_PATH (or DURATION_SHARED_DIR) enables the SQLite tier;
+    # leave both unset for memory only
+    maxsize = int(os.environ.get('DURATION_CACHE_SIZE', '1024'))
+    ttl = float(os.environ.get('DURATION_CACHE_TTL', '3600'))
+    path = os.environ.get('DURATION_CACHE_PATH') or shared_cache_path()
+    disk = None
+    if path:
+        disk_ttl = float(os.environ.get('DURATION_CACHE_DISK_TTL', str(ttl * 24)))
+        stale_grace = float(os.environ.get('DURATION_CACHE_STALE_GRACE', str(disk_ttl)))
+        disk = SQLiteCache(path, ttl=disk_ttl, stale_grace=stale_grace)
+    return DurationCache(TTLCache(maxsize=maxsize, ttl=ttl), disk)
@@ -0,0 +1,68 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class ExecutorBusy(Exception):
+    """Raised when the extraction executor's queue is full."""
+
+
+class BoundedExecutor:
+    """Thread pool with a bounded backlog for blocking extraction work.
+
+    At most `max_workers` calls run at once and at most `queue_size` more
+    wait for a thread; anything beyond that is rejected with ExecutorBusy
+    instead of queueing without limit. The pool is created on first use, so
+    the executor can be started again after shutdown().
+    """
+
+    def __init__(self, max_workers: int = 16, queue_size: int = 64):
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self._slots = threading.BoundedSemaphore(max_workers + queue_size)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def start(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="extract")
+            return self._pool
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Schedule `fn` or raise ExecutorBusy; the slot is held until it finishes."""
+        if not self._slots.acquire(blocking=False):
+            raise ExecutorBusy(f"Extraction queue is full ({self.queue_size} waiting)")
+        try:
+            future = self.start().submit(fn, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def full(self) -> bool:
+        """True when submit() would raise ExecutorBusy right now."""
+        if not self._slots.acquire(blocking=False):
+            return True
+        self._slots.release()
+        return False
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def shutdown(self) -> None:
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+RETRY_AFTER_SECONDS = int(os.environ.get('DURATION_RETRY_AFTER', '5'))
+
+extraction_executor = BoundedExecutor(
+    max_workers=int(os.environ.get('DURATION_EXECUTOR_WORKERS', '16')),
+    queue_size=int(os.environ.get('DURATION_EXECUTOR_QUEUE', '64')),
+)
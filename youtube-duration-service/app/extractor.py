@@ -1,12 +1,41 @@
+import html
+import os
 import re
-from typing import Dict, Optional
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Callable, Dict, Optional
 from urllib.parse import urlparse, parse_qs
 
+from . import metrics
+from .cache import DurationCache, build_cache_from_env
+from .executor import RETRY_AFTER_SECONDS, extraction_executor
+from .resilience import CircuitBreaker, TokenBucket
+from .shared import cross_process_lock
+from .ytdl_pool import YDL_OPTS, PoolExhausted, YoutubeDLPool
+
 
 class ExtractionError(Exception):
     pass
 
 
+class UpstreamError(ExtractionError):
+    """Upstream itself failed: network error, timeout, HTTP 429 or 5xx."""
+
+
+class VideoUnavailable(ExtractionError):
+    """Upstream answered, but has no duration for this video (unknown, private, ...)."""
+
+
+class UpstreamUnavailable(ExtractionError):
+    """Extraction was not attempted: rate limited, circuit open or no yt-dlp instance free."""
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 def seconds_to_hms(total_seconds: int) -> str:
     if total_seconds is None:
         return "00:00:00"
@@ -17,10 +46,11 @@ def seconds_to_hms(total_seconds: int) -> str:
     return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
 
 
+_ISO8601_DURATION_RE = re.compile(r"^PT(?:(?P<h>\d+)H)?(?:(?P<m>\d+)M)?(?:(?P<s>\d+)S)?$")
+
+
 def parse_iso8601_duration(duration: str) -> int:
-    # Retained for potential future use; not used without API
-    pattern = re.compile(r"^PT(?:(?P<h>\d+)H)?(?:(?P<m>\d+)M)?(?:(?P<s>\d+)S)?$")
-    match = pattern.match(duration)
+    match = _ISO8601_DURATION_RE.match(duration)
     if not match:
         raise ExtractionError(f"Unrecognized ISO8601 duration: {duration}")
     hours = int(match.group('h') or 0)
@@ -29,7 +59,56 @@ def parse_iso8601_duration(duration: str) -> int:
     return hours * 3600 + minutes * 60 + seconds
 
 
-def extract_youtube_id(url: str) -> Optional[str]:
+YOUTUBE_HOSTS = frozenset({
+    'youtube.com', 'www.youtube.com', 'm.youtube.com', 'music.youtube.com',
+    'youtube-nocookie.com', 'www.youtube-nocookie.com',
+    'youtu.be', 'www.youtu.be',
+})
+
+# Single pass over the common shapes: watch?v=, youtu.be/, shorts|embed|v|live/
+_FAST_ID_RE = re.compile(
+    r"^(?:https?://)?(?:www\.|m\.|music\.)?"
+    r"(?:youtu\.be/(?P<short>[A-Za-z0-9_-]+)"
+    r"|youtube(?:-nocookie)?\.com/"
+    r"(?:(?:shorts|embed|v|live)/(?P<path>[A-Za-z0-9_-]+)"
+    r"|watch/?\?(?:[^#]*?&)?v=(?P<v>[A-Za-z0-9_-]+)))"
+    r"(?=[/?&#]|$)",
+    re.IGNORECASE,
+)
+_HOST_RE = re.compile(r"^(?:[A-Za-z][A-Za-z0-9+.-]*:)?//(?:[^@/?#]*@)?([^:/?#]*)|^([^:/?#]*)[/?#]")
+_BARE_ID_RE = re.compile(r"^[A-Za-z0-9_-]{11}$")
+_PATH_ID_RE = re.compile(r"([A-Za-z0-9_-]{11})")
+_PATH_PREFIXES = frozenset({"shorts", "embed", "v", "live"})
+
+
+def is_youtube_host(url: str) -> bool:
+    m = _HOST_RE.match(url)
+    if m is None:
+        return False
+    return (m.group(1) or m.group(2) or '').lower() in YOUTUBE_HOSTS
+
+
+def extract_youtube_id(url: str, guess: bool = True) -> Optional[str]:
+    # guess=False skips the last resort of taking any 11 characters from the
+    # path, which can be a word ("attribution") or a channel name
+    url = url.strip()
+    m = _FAST_ID_RE.match(url)
+    if m is not None:
+        return m.group('v') or m.group('short') or m.group('path')
+
+    if _BARE_ID_RE.match(url):
+        return url
+
+    # Fast reject: never parse (or hand to yt-dlp) URLs for other hosts
+    if not is_youtube_host(url):
+        return None
+    return _extract_youtube_id_slow(url, guess)
+
+
+def _extract_youtube_id_slow(url: str, guess: bool = True) -> Optional[str]:
+    # Less common shapes on YouTube hosts (extra params, encoded ids, ...)
+    if '//' not in url:
+        url = '//' + url
     try:
         parsed = urlparse(url)
     except Exception:
@@ -51,43 +130,87 @@ def extract_youtube_id(url: str) -> Optional[str]:
         return parts[0] if parts[0] else None
 
     # youtube.com/shorts/<id>
-    if len(parts) >= 2 and parts[0] in {"shorts", "embed", "v", "live"}:
+    if len(parts) >= 2 and parts[0] in _PATH_PREFIXES:
         return parts[1]
 
+    if not guess:
+        return None
+
     # As a last resort, try to find 11-char video IDs in path
-    m = re.search(r"([A-Za-z0-9_-]{11})", path)
+    m = _PATH_ID_RE.search(path)
     if m:
         return m.group(1)
 
     return None
 
 
-def _extract_with_ytdlp(url: str) -> Dict:
-    try:
-        # Import locally to keep it optional
-        from yt_dlp import YoutubeDL  # type: ignore
-    except Exception as e:
-        raise ExtractionError(f"yt-dlp not available: {e}")
+_UPSTREAM_MESSAGES = ('HTTP Error 429', 'Too Many Requests', 'HTTP Error 5', 'timed out', 'not a bot')
+
+
+def _exception_chain(error: BaseException):
+    # The error, its causes and contexts, and what yt-dlp wraps in exc_info
+    seen = set()
+    stack = [error]
+    while stack:
+        e = stack.pop()
+        if not isinstance(e, BaseException) or id(e) in seen:
+            continue
+        seen.add(id(e))
+        yield e
+        exc_info = getattr(e, 'exc_info', None)
+        if isinstance(exc_info, tuple) and len(exc_info) == 3:
+            stack.append(exc_info[1])
+        stack.extend((e.__cause__, e.__context__, getattr(e, 'cause', None)))
 
-    ydl_opts = {
-        'quiet': True,
-        'noplaylist': True,
-        'skip_download': True,
-        'nocheckcertificate': True,
-        'socket_timeout': 10,
-    }
 
+def _is_upstream_failure(error: BaseException) -> bool:
+    for e in _exception_chain(error):
+        if isinstance(e, (TimeoutError, ConnectionError)):
+            return True
+        if isinstance(e, urllib.error.URLError) and not isinstance(e, urllib.error.HTTPError):
+            return True
+        status = getattr(e, 'status', None)
+        if not isinstance(status, int):
+            status = getattr(e, 'code', None)
+        if isinstance(status, int) and (status == 429 or 500 <= status < 600):
+            return True
+        # yt-dlp's network errors, matched by name to keep yt-dlp optional
+        if any(cls.__name__ == 'TransportError' for cls in type(e).__mro__):
+            return True
+        if any(message in str(e) for message in _UPSTREAM_MESSAGES):
+            return True
+    return False
+
+
+def _is_video_failure(error: BaseException) -> bool:
+    # yt-dlp flags errors about the video itself (unavailable, private,
+    # unsupported URL) as expected
+    return any(getattr(e, 'expected', False) is True for e in _exception_chain(error))
+
+
+def _extract_with_ytdlp(url: str) -> Dict:
     try:
-        with YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
+        if ydl_pool.started:
+            with ydl_pool.checkout(timeout=POOL_CHECKOUT_TIMEOUT) as ydl:
+                info = ydl.extract_info(url, download=False)
+        else:
+            info = _extract_with_fresh_ytdlp(url)
+    except ExtractionError:
+        raise
+    except PoolExhausted as e:
+        raise UpstreamUnavailable(f"yt-dlp is busy: {e}", RETRY_AFTER_SECONDS) from e
     except Exception as e:
-        raise ExtractionError(f"yt-dlp failed: {e}")
+        if _is_upstream_failure(e):
+            raise UpstreamError(f"yt-dlp failed: {e}") from e
+        if _is_video_failure(e):
+            raise VideoUnavailable(f"yt-dlp failed: {e}") from e
+        raise ExtractionError(f"yt-dlp failed: {e}") from e
 
     duration = info.get('duration')
     title = info.get('title')
     vid = info.get('id')
     if duration is None or vid is None:
-        raise ExtractionError("Missing duration or id in yt-dlp info")
+        raise VideoUnavailable("Missing duration or id in yt-dlp info")
 
     return {
         'id': vid,
@@ -98,11 +221,291 @@ def _extract_with_ytdlp(url: str) -> Dict:
     }
 
 
-def get_duration_info(url: str) -> Dict:
-    # Use yt-dlp only (no API key)
+# Watch-page fast path: fetch only the HTML and read the few fields we return.
+# DURATION_WATCH_BASE_URL can point at a local stub server serving fixtures.
+FAST_PATH_ENABLED = os.environ.get('DURATION_FAST_PATH', '1') != '0'
+WATCH_BASE_URL = os.environ.get('DURATION_WATCH_BASE_URL', 'https://www.youtube.com').rstrip('/')
+WATCH_TIMEOUT = float(os.environ.get('DURATION_WATCH_TIMEOUT', '5'))
+WATCH_MAX_BYTES = 4 * 1024 * 1024
+
+_WATCH_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9',
+    # Skip the EU consent interstitial, which has no video metadata
+    'Cookie': 'CONSENT=YES+1',
+}
+
+_LENGTH_SECONDS_RE = re.compile(r'"lengthSeconds"\s*:\s*"(\d+)"')
+_VIDEO_ID_RE = re.compile(r'"videoId"\s*:\s*"([A-Za-z0-9_-]{11})"')
+_META_DURATION_RE = re.compile(r'<meta\s+itemprop="duration"\s+content="([^"]+)"')
+_META_TITLE_RE = re.compile(r'<meta\s+(?:name="title"|property="og:title")\s+content="([^"]*)"')
+
+
+def _fetch_watch_page(video_id: str) -> str:
+    url = f"{WATCH_BASE_URL}/watch?v={video_id}"
+    request = urllib.request.Request(url, headers=_WATCH_HEADERS)
+    try:
+        with urllib.request.urlopen(request, timeout=WATCH_TIMEOUT) as resp:
+            body = resp.read(WATCH_MAX_BYTES)
+            charset = resp.headers.get_content_charset() or 'utf-8'
+    except Exception as e:
+        error = UpstreamError if _is_upstream_failure(e) else ExtractionError
+        raise error(f"Watch page fetch failed: {e}") from e
+    return body.decode(charset, errors='replace')
+
+
+def parse_watch_page(page: str, video_id: str) -> Dict:
+    # The player response must be for the requested video, not a redirect target
+    m = _VIDEO_ID_RE.search(page)
+    if m is None or m.group(1) != video_id:
+        raise ExtractionError("Watch page does not describe the requested video")
+
+    m = _LENGTH_SECONDS_RE.search(page)
+    if m is not None:
+        duration = int(m.group(1))
+    else:
+        m = _META_DURATION_RE.search(page)
+        if m is None:
+            raise ExtractionError("No duration found on watch page")
+        duration = parse_iso8601_duration(m.group(1))
+
+    # Live streams and premieres report 0; let yt-dlp decide what they are
+    if duration <= 0:
+        raise ExtractionError("Watch page reports no duration")
+
+    m = _META_TITLE_RE.search(page)
+    title = html.unescape(m.group(1)) if m else ''
+
+    return {
+        'id': video_id,
+        'title': title,
+        'duration_seconds': duration,
+        'duration_human': seconds_to_hms(duration),
+        'source': 'watch_page',
+    }
+
+
+def _extract_with_watch_page(video_id: str) -> Dict:
+    return parse_watch_page(_fetch_watch_page(video_id), video_id)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[Dict] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Collapses concurrent calls for the same key into one execution.
+
+    The first caller for a key runs `fn`; callers arriving while it is in
+    flight block until it finishes and receive the same result or error.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], Dict]) -> Dict:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+cache: DurationCache = build_cache_from_env()
+metrics.registry.register(metrics.Counter(
+    'duration_cache_hits_total', 'Cache lookups answered from memory or disk.', func=lambda: cache.hits,
+))
+metrics.registry.register(metrics.Counter(
+    'duration_cache_misses_total', 'Cache lookups that required an extraction.', func=lambda: cache.misses,
+))
+metrics.registry.register(metrics.Gauge(
+    'duration_cache_hit_ratio', 'Cache hits divided by lookups since start.',
+    func=lambda: cache.stats()['hit_ratio'],
+))
+# One instance per extraction thread, so no worker waits on the pool
+ydl_pool = YoutubeDLPool(size=int(os.environ.get('DURATION_YTDL_POOL_SIZE', extraction_executor.max_workers)))
+POOL_CHECKOUT_TIMEOUT = float(os.environ.get('DURATION_YTDL_CHECKOUT_TIMEOUT', '30'))
+_flight = SingleFlight()
+
+# Protect YouTube (and our workers) when upstream starts throttling us
+rate_limiter = TokenBucket(
+    rate=float(os.environ.get('DURATION_UPSTREAM_RATE', '5')),
+    burst=float(os.environ.get('DURATION_UPSTREAM_BURST', '10')),
+)
+RATE_LIMIT_WAIT = float(os.environ.get('DURATION_RATE_LIMIT_WAIT', '2'))
+breaker = CircuitBreaker(
+    failure_threshold=int(os.environ.get('DURATION_BREAKER_FAILURES', '5')),
+    cooldown=float(os.environ.get('DURATION_BREAKER_COOLDOWN', '30')),
+    half_open_max=int(os.environ.get('DURATION_BREAKER_HALF_OPEN', '1')),
+)
+SERVE_STALE = os.environ.get('DURATION_SERVE_STALE', '1') != '0'
+
+_BREAKER_STATES = {CircuitBreaker.CLOSED: 0, CircuitBreaker.HALF_OPEN: 1, CircuitBreaker.OPEN: 2}
+metrics.registry.register(metrics.Gauge(
+    'duration_breaker_state', 'Upstream circuit breaker: 0 closed, 1 half-open, 2 open.',
+    func=lambda: _BREAKER_STATES[breaker.state],
+))
+
+
+def _extract_with_fresh_ytdlp(url: str) -> Dict:
+    # Fallback used when the pool has not been started (e.g. outside the app)
     try:
-        return _extract_with_ytdlp(url)
+        # Import locally to keep it optional
+        from yt_dlp import YoutubeDL  # type: ignore
+    except Exception as e:
+        raise ExtractionError(f"yt-dlp not available: {e}")
+
+    with YoutubeDL(dict(YDL_OPTS)) as ydl:
+        return ydl.extract_info(url, download=False)
+
+
+def _error_type(error: BaseException) -> str:
+    # ExtractionError wraps the real failure; report the underlying class
+    cause = error.__cause__ or error.__context__
+    return type(cause or error).__name__
+
+
+def _timed_extract(source: str, fn: Callable[[str], Dict], arg: str) -> Dict:
+    start = time.perf_counter()
+    try:
+        info = fn(arg)
+    except ExtractionError as e:
+        metrics.extraction_seconds.observe(time.perf_counter() - start, source=source, outcome='error')
+        metrics.extraction_errors.inc(source=source, type=_error_type(e))
+        raise
+    metrics.extraction_seconds.observe(time.perf_counter() - start, source=source, outcome='ok')
+    return info
+
+
+def _resolve_uncached(url: str, video_id: Optional[str]) -> Dict:
+    watch_error = None
+    if FAST_PATH_ENABLED and video_id is not None:
+        try:
+            return _timed_extract('watch_page', _extract_with_watch_page, video_id)
+        except ExtractionError as e:
+            # Any surprise on the watch page falls through to full yt-dlp
+            watch_error = e
+
+    # No API key: yt-dlp is the full fallback
+    try:
+        return _timed_extract('yt_dlp', _extract_with_ytdlp, url)
+    except UpstreamUnavailable:
+        # yt-dlp was never tried, so the watch page error says nothing either
+        raise
     except ExtractionError as e:
-        raise ExtractionError(
+        # yt-dlp has the last word on the video itself; short of that, an
+        # upstream failure on either path makes this an upstream failure
+        if isinstance(e, VideoUnavailable):
+            error = VideoUnavailable
+        elif isinstance(e, UpstreamError) or isinstance(watch_error, UpstreamError):
+            error = UpstreamError
+        else:
+            error = ExtractionError
+        raise error(
             "Failed to extract duration with yt-dlp. Ensure 'yt-dlp' is installed and the URL is valid."
         ) from e
+
+
+def _resolve_guarded(url: str, video_id: Optional[str]) -> Dict:
+    if not breaker.allow():
+        metrics.upstream_rejections.inc(reason='circuit_open')
+        raise UpstreamUnavailable("Upstream circuit is open; failing fast", breaker.retry_after())
+    if not rate_limiter.acquire(timeout=RATE_LIMIT_WAIT):
+        breaker.cancel()
+        metrics.upstream_rejections.inc(reason='rate_limited')
+        raise UpstreamUnavailable("Upstream rate limit exceeded", 1.0 / max(rate_limiter.rate, 1e-9))
+
+    try:
+        info = _resolve_uncached(url, video_id)
+    except UpstreamError:
+        breaker.record_failure()
+        raise
+    except Exception:
+        # Unknown, private or malformed videos are the caller's problem, not
+        # upstream's; they must never open the circuit for everyone else
+        breaker.cancel()
+        raise
+    breaker.record_success()
+    return info
+
+
+def _resolve_unkeyed(url: str) -> Dict:
+    # The URL does not plainly name its video, so there is no safe key for
+    # the cache, single-flight or lock: yt-dlp resolves the full URL and the
+    # result is stored under the id it reports
+    metrics.extractions_in_flight.inc()
+    try:
+        info = _resolve_guarded(url, None)
+    finally:
+        metrics.extractions_in_flight.dec()
+    if _BARE_ID_RE.match(info['id']):
+        cache.set(info['id'], info)
+    return info
+
+
+def get_duration_info(url: str, refresh: bool = False) -> Dict:
+    # refresh=True skips the cache read for this call but stores the fresh result
+    video_id = extract_youtube_id(url, guess=False)
+    if video_id is None or not _BARE_ID_RE.match(video_id):
+        if extract_youtube_id(url) is None:
+            raise ExtractionError("Not a recognized YouTube video URL")
+        return _resolve_unkeyed(url)
+    if not refresh:
+        cached = cache.get(video_id)
+        if cached is not None:
+            return cached
+
+    def resolve() -> Dict:
+        # Other workers may be extracting the same video: wait for them, then
+        # re-check the shared store before doing the work ourselves
+        with cross_process_lock(video_id) as locked:
+            if locked and not refresh:
+                shared = cache.get_shared(video_id)
+                if shared is not None:
+                    return shared
+            return extract()
+
+    def extract() -> Dict:
+        metrics.extractions_in_flight.inc()
+        try:
+            info = _resolve_guarded(url, video_id)
+        except UpstreamUnavailable:
+            stale = cache.get_stale(video_id) if SERVE_STALE else None
+            if stale is None:
+                raise
+            return dict(stale, stale=True)
+        finally:
+            metrics.extractions_in_flight.dec()
+
+        cache.set(video_id, info)
+        return info
+
+    # Concurrent lookups for the same video share a single extraction
+    return _flight.do(video_id, resolve)
+
@@ -1,11 +1,50 @@
-from fastapi import FastAPI, HTTPException, Query
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
-from .extractor import get_duration_info, ExtractionError
+from .extractor import (
+    cache,
+    extract_youtube_id,
+    get_duration_info,
+    ExtractionError,
+    UpstreamError,
+    UpstreamUnavailable,
+    ydl_pool,
+)
+from .executor import ExecutorBusy, RETRY_AFTER_SECONDS, extraction_executor
+from . import metrics
+from .streaming import format_ndjson, format_sse, resolve_duration_infos, stream_duration_infos
+
+
+BATCH_MAX_URLS = 500
+STREAM_MAX_URLS = 10000
+
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pre-warm YoutubeDL instances once; requests check them out from the pool
+    try:
+        ydl_pool.start()
+    except Exception as e:
+        logger.warning("YoutubeDL pool not started, falling back to per-request instances: %s", e)
+    # The executor is restartable, so a later lifespan in this process works too
+    extraction_executor.start()
+    yield
+    extraction_executor.shutdown()
+    ydl_pool.close()
 
 
-app = FastAPI(title="YouTube Duration Service", version="1.0.0")
+app = FastAPI(title="YouTube Duration Service", version="1.0.0", lifespan=lifespan)
 
 # Allow all origins for convenience; adjust as needed
 app.add_middleware(
@@ -17,33 +56,137 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template, not raw path, to keep cardinality bounded
+        route = request.scope.get("route")
+        path = getattr(route, "path", "unmatched")
+        metrics.http_requests.inc(method=request.method, path=path, status=str(status))
+        metrics.http_request_seconds.observe(time.perf_counter() - start, method=request.method, path=path)
+
+
 class URLRequest(BaseModel):
     url: str
+    refresh: bool = False
+
+
+class BatchRequest(BaseModel):
+    urls: List[str]
+    max_workers: Optional[int] = None
+    timeout: Optional[float] = None
 
 
 @app.get("/health")
-def health():
+async def health():
     return {"status": "ok"}
 
 
-@app.get("/duration")
-def get_duration(url: str = Query(..., description="YouTube video URL")):
+async def _resolve(url: str, refresh: bool):
+    # Extraction blocks on yt-dlp, so it runs on the dedicated executor and
+    # never ties up the event loop or Starlette's shared threadpool
     try:
-        info = get_duration_info(url)
-        return info
+        return await extraction_executor.run(get_duration_info, url, refresh=refresh)
+    except ExecutorBusy as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+        )
+    except UpstreamUnavailable as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
+        )
+    except UpstreamError as e:
+        # YouTube failed (timeout, 429, 5xx), not the request
+        raise HTTPException(status_code=502, detail=str(e))
     except ExtractionError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Failed to resolve duration: {e}")
 
 
+@app.get("/metrics")
+async def get_metrics():
+    return Response(content=metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@app.get("/duration")
+async def get_duration(
+    url: str = Query(..., description="YouTube video URL"),
+    refresh: bool = Query(False, description="Bypass the cache for this request"),
+):
+    return await _resolve(url, refresh)
+
+
 @app.post("/duration")
-def post_duration(body: URLRequest):
-    try:
-        info = get_duration_info(body.url)
-        return info
-    except ExtractionError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=f"Failed to resolve duration: {e}")
+async def post_duration(body: URLRequest):
+    return await _resolve(body.url, body.refresh)
+
+
+@app.post("/durations")
+async def post_durations(body: BatchRequest):
+    if not body.urls:
+        raise HTTPException(status_code=400, detail="urls must not be empty")
+    if len(body.urls) > BATCH_MAX_URLS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_URLS} urls per batch")
+    if extraction_executor.full():
+        # Admission control: once accepted, items wait for room like streams do
+        raise HTTPException(
+            status_code=503,
+            detail=f"Extraction queue is full ({extraction_executor.queue_size} waiting)",
+            headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+        )
+    results = await resolve_duration_infos(body.urls, body.max_workers, body.timeout)
+    errors = sum(1 for r in results if not r['ok'])
+    return {"count": len(results), "errors": errors, "results": results}
+
+
+@app.post("/durations/stream")
+async def post_durations_stream(
+    body: BatchRequest,
+    request: Request,
+    format: Optional[str] = Query(None, description="ndjson or sse; defaults from the Accept header"),
+):
+    if not body.urls:
+        raise HTTPException(status_code=400, detail="urls must not be empty")
+    if len(body.urls) > STREAM_MAX_URLS:
+        raise HTTPException(status_code=400, detail=f"At most {STREAM_MAX_URLS} urls per stream")
+    if format is None:
+        format = "sse" if "text/event-stream" in request.headers.get("accept", "") else "ndjson"
+    if format not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'sse'")
+
+    encode = format_sse if format == "sse" else format_ndjson
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+
+    async def records():
+        async for record in stream_duration_infos(body.urls, body.max_workers, body.timeout):
+            yield encode(record)
+
+    # Disable proxy buffering so each record reaches the client immediately
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(records(), media_type=media_type, headers=headers)
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    return cache.stats()
+
 
+@app.delete("/cache")
+def invalidate_cache(url: str = Query(..., description="YouTube video URL")):
+    # Guessed ids are never cached, so there is nothing to invalidate for them
+    video_id = extract_youtube_id(url, guess=False)
+    if not video_id:
+        raise HTTPException(status_code=400, detail="Could not determine video id from URL")
+    cache.invalidate(video_id)
+    return {"id": video_id, "invalidated": True}
@@ -0,0 +1,37 @@
+"""Run the service with several uvicorn workers sharing one result store.
+
+    python -m app.serve --workers 4 --shared-dir /var/tmp/duration-service
+
+Each worker keeps its own in-memory cache, but all of them read and write
+the SQLite store in the shared directory and coordinate extractions for the
+same video through lock files there, so a video is extracted once per host.
+"""
+
+import argparse
+import os
+import tempfile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        '--shared-dir',
+        default=os.environ.get('DURATION_SHARED_DIR') or os.path.join(tempfile.gettempdir(), 'duration-service'),
+        help='directory for the shared SQLite store and lock files',
+    )
+    args = parser.parse_args()
+
+    os.makedirs(args.shared_dir, exist_ok=True)
+    # Workers are spawned after this point and inherit the environment
+    os.environ['DURATION_SHARED_DIR'] = args.shared_dir
+
+    import uvicorn
+
+    uvicorn.run('app.main:app', host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+import hashlib
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: cross-process locking is unavailable
+    fcntl = None
+
+
+# State shared by all uvicorn workers on one host: the SQLite result store
+# and striped lock files used for cross-process single-flight.
+SHARED_DIR = os.environ.get('DURATION_SHARED_DIR')
+LOCK_STRIPES = 4096
+LOCK_TIMEOUT = float(os.environ.get('DURATION_SHARED_LOCK_TIMEOUT', '60'))
+LOCK_POLL_INTERVAL = 0.02
+
+
+def shared_cache_path() -> Optional[str]:
+    if not SHARED_DIR:
+        return None
+    return os.path.join(SHARED_DIR, 'durations.db')
+
+
+def _lock_path(key: str) -> str:
+    # A fixed number of lock files keeps the directory bounded
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+    stripe = int.from_bytes(digest, 'big') % LOCK_STRIPES
+    return os.path.join(SHARED_DIR, 'locks', f'{stripe:04d}.lock')
+
+
+@contextmanager
+def cross_process_lock(key: str, timeout: float = LOCK_TIMEOUT) -> Iterator[bool]:
+    """Hold an exclusive flock for `key` across worker processes.
+
+    Yields True when the lock is held. If locking is unavailable or the
+    wait exceeds `timeout`, yields False so the caller can carry on
+    without coordination rather than stall.
+    """
+    if not SHARED_DIR or fcntl is None:
+        yield False
+        return
+
+    path = _lock_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        deadline = time.monotonic() + timeout
+        locked = False
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                locked = True
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    break
+                time.sleep(LOCK_POLL_INTERVAL)
+        try:
+            yield locked
+        finally:
+            if locked:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
@@ -0,0 +1,126 @@
+import asyncio
+import json
+import os
+import time
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from .executor import ExecutorBusy, extraction_executor
+from .extractor import ExtractionError, extract_youtube_id, get_duration_info
+
+
+BATCH_MAX_WORKERS = int(os.environ.get('DURATION_BATCH_WORKERS', '8'))
+BATCH_ITEM_TIMEOUT = float(os.environ.get('DURATION_BATCH_ITEM_TIMEOUT', '30'))
+BUSY_RETRY_DELAY = 0.05
+
+
+async def _resolve_one(url: str, item_timeout: float) -> Dict:
+    deadline = time.monotonic() + item_timeout
+    while True:
+        try:
+            info = await asyncio.wait_for(
+                extraction_executor.run(get_duration_info, url),
+                timeout=max(0.0, deadline - time.monotonic()),
+            )
+            return {'ok': True, 'result': info}
+        except ExecutorBusy:
+            # Streams are long-lived; wait for room instead of failing the item
+            if time.monotonic() + BUSY_RETRY_DELAY >= deadline:
+                return {'ok': False, 'error': f"Timed out after {item_timeout:g}s waiting for a worker"}
+            await asyncio.sleep(BUSY_RETRY_DELAY)
+        except asyncio.TimeoutError:
+            return {'ok': False, 'error': f"Timed out after {item_timeout:g}s"}
+        except ExtractionError as e:
+            return {'ok': False, 'error': str(e)}
+        except Exception as e:
+            return {'ok': False, 'error': f"Failed to resolve duration: {e}"}
+
+
+async def stream_duration_infos(
+    urls: Iterable[str],
+    max_workers: Optional[int] = None,
+    item_timeout: Optional[float] = None,
+) -> AsyncIterator[Dict]:
+    """Yield one record per input URL as soon as it resolves, then a summary.
+
+    Only `max_workers` lookups are in flight at a time and nothing is kept
+    once emitted, so memory stays flat regardless of batch size. URLs for a
+    video that is already in flight share its result.
+    """
+    max_workers = max(1, min(max_workers or BATCH_MAX_WORKERS, BATCH_MAX_WORKERS))
+    item_timeout = item_timeout or BATCH_ITEM_TIMEOUT
+    start = time.monotonic()
+    count = errors = 0
+
+    # key -> (task, [(index, url), ...]) for lookups still in flight
+    waiting: Dict[str, Tuple[asyncio.Task, List[Tuple[int, str]]]] = {}
+    task_keys: Dict[asyncio.Task, str] = {}
+    source = iter(enumerate(urls))
+    exhausted = False
+
+    try:
+        while waiting or not exhausted:
+            while not exhausted and len(waiting) < max_workers:
+                item = next(source, None)
+                if item is None:
+                    exhausted = True
+                    break
+                index, url = item
+                # Guessed ids could belong to different videos; those only
+                # share a task with the very same URL
+                key = extract_youtube_id(url, guess=False) or url
+                if key in waiting:
+                    waiting[key][1].append((index, url))
+                    continue
+                task = asyncio.ensure_future(_resolve_one(url, item_timeout))
+                waiting[key] = (task, [(index, url)])
+                task_keys[task] = key
+
+            if not waiting:
+                break
+            done, _ = await asyncio.wait(task_keys, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                key = task_keys.pop(task)
+                _, targets = waiting.pop(key)
+                outcome = task.result()
+                for index, url in targets:
+                    count += 1
+                    errors += 0 if outcome['ok'] else 1
+                    yield dict(type='result', index=index, url=url, **outcome)
+    finally:
+        # Client went away or generator closed early: stop outstanding work
+        for task in task_keys:
+            task.cancel()
+
+    yield {
+        'type': 'summary',
+        'count': count,
+        'errors': errors,
+        'elapsed_s': round(time.monotonic() - start, 3),
+    }
+
+
+async def resolve_duration_infos(
+    urls: List[str],
+    max_workers: Optional[int] = None,
+    item_timeout: Optional[float] = None,
+) -> List[Dict]:
+    """Resolve a whole batch; returns one entry per input URL, in order.
+
+    Every lookup goes through the shared extraction executor, so batches
+    count against its bound like any other request.
+    """
+    results: List[Optional[Dict]] = [None] * len(urls)
+    async for record in stream_duration_infos(urls, max_workers, item_timeout):
+        if record['type'] == 'result':
+            index = record.pop('index')
+            del record['type']
+            results[index] = record
+    return results
+
+
+def format_ndjson(record: Dict) -> str:
+    return json.dumps(record, separators=(',', ':')) + '\n'
+
+
+def format_sse(record: Dict) -> str:
+    return f"event: {record['type']}\ndata: {json.dumps(record, separators=(',', ':'))}\n\n"
@@ -0,0 +1,83 @@
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+YDL_OPTS: Dict[str, Any] = {
+    'quiet': True,
+    'noplaylist': True,
+    'skip_download': True,
+    'nocheckcertificate': True,
+    'socket_timeout': 10,
+}
+
+
+class PoolExhausted(Exception):
+    """Raised when no YoutubeDL instance is returned within the checkout timeout."""
+
+
+def _default_factory() -> Any:
+    # Import locally to keep it optional
+    from yt_dlp import YoutubeDL  # type: ignore
+    return YoutubeDL(dict(YDL_OPTS))
+
+
+class YoutubeDLPool:
+    """Fixed-size pool of pre-built YoutubeDL instances.
+
+    YoutubeDL is not safe to share between threads, so each instance is
+    handed to exactly one caller at a time via `checkout()`. Reusing the
+    instances keeps the extractor registry and HTTP sessions warm.
+    """
+
+    def __init__(self, size: int = 4, factory: Optional[Callable[[], Any]] = None):
+        self.size = max(1, size)
+        self._factory = factory or _default_factory
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._all: List[Any] = []
+        self._lock = threading.Lock()
+        self.started = False
+
+    def start(self) -> None:
+        with self._lock:
+            if self.started:
+                return
+            for _ in range(self.size):
+                ydl = self._factory()
+                self._all.append(ydl)
+                self._idle.put(ydl)
+            self.started = True
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        try:
+            ydl = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            # Not a TimeoutError: this is local contention, not a slow upstream
+            raise PoolExhausted(f"No YoutubeDL instance available within {timeout}s") from None
+        try:
+            yield ydl
+        finally:
+            if self.started:
+                self._idle.put(ydl)
+            else:
+                # Pool was closed while this instance was checked out
+                _close(ydl)
+
+    def close(self) -> None:
+        with self._lock:
+            for ydl in self._all:
+                _close(ydl)
+            self._all = []
+            self._idle = queue.LifoQueue()
+            self.started = False
+
+
+def _close(ydl: Any) -> None:
+    close = getattr(ydl, 'close', None)
+    if close is not None:
+        try:
+            close()
+        except Exception:
+            pass
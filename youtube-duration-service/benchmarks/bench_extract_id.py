@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: extract_youtube_id against the previous urlparse/parse_qs version.
+
+Run from the service directory:
+
+    python benchmarks/bench_extract_id.py [--rounds 20000]
+"""
+
+import argparse
+import os
+import re
+import sys
+import timeit
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.extractor import extract_youtube_id  # noqa: E402
+
+
+# URL shapes seen in real traffic, plus some hosts we should reject quickly
+CORPUS = [
+    "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://youtube.com/watch?v=dQw4w9WgXcQ&t=42s",
+    "https://www.youtube.com/watch?feature=share&v=dQw4w9WgXcQ",
+    "https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=PLFgquLnL59alCl_2TQvOiD5Vgm1hCaGSI&index=2",
+    "https://m.youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://music.youtube.com/watch?v=dQw4w9WgXcQ&si=abc",
+    "https://youtu.be/dQw4w9WgXcQ",
+    "https://youtu.be/dQw4w9WgXcQ?si=Gm3ql3UXbQx5iF0C&t=10",
+    "http://youtu.be/dQw4w9WgXcQ",
+    "https://www.youtube.com/shorts/aqz-KE-bpKQ",
+    "https://youtube.com/shorts/aqz-KE-bpKQ?feature=share",
+    "https://www.youtube.com/embed/dQw4w9WgXcQ?autoplay=1",
+    "https://www.youtube-nocookie.com/embed/dQw4w9WgXcQ",
+    "https://www.youtube.com/live/jfKfPfyJRdk?si=x",
+    "https://www.youtube.com/v/dQw4w9WgXcQ",
+    "youtube.com/watch?v=dQw4w9WgXcQ",
+    "www.youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://www.youtube.com/attribution_link?a=x&u=/watch%3Fv%3DdQw4w9WgXcQ",
+    "dQw4w9WgXcQ",
+    "https://vimeo.com/76979871",
+    "https://www.example.com/watch?v=dQw4w9WgXcQ",
+    "https://evil.example/youtube.com/watch?v=dQw4w9WgXcQ",
+    "not a url at all",
+]
+
+
+def legacy_extract_youtube_id(url: str) -> Optional[str]:
+    # Implementation before the precompiled matcher, kept for comparison
+    try:
+        parsed = urlparse(url)
+    except Exception:
+        return None
+
+    qs = parse_qs(parsed.query)
+    if 'v' in qs and qs['v']:
+        return qs['v'][0]
+
+    path = parsed.path.strip('/')
+    parts = path.split('/') if path else []
+    if not parts:
+        return None
+
+    if parsed.netloc in {"youtu.be"}:
+        return parts[0] if parts[0] else None
+
+    if len(parts) >= 2 and parts[0] in {"shorts", "embed", "v", "live"}:
+        return parts[1]
+
+    m = re.search(r"([A-Za-z0-9_-]{11})", path)
+    if m:
+        return m.group(1)
+
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=20000, help='passes over the corpus')
+    args = parser.parse_args()
+
+    print(f"{'url':<80} {'legacy':<13} {'current':<13}")
+    for url in CORPUS:
+        old, new = legacy_extract_youtube_id(url), extract_youtube_id(url)
+        marker = '' if old == new else '  (changed)'
+        print(f"{url[:80]:<80} {str(old):<13} {str(new):<13}{marker}")
+
+    n = args.rounds * len(CORPUS)
+    results = {}
+    for name, fn in (('legacy', legacy_extract_youtube_id), ('current', extract_youtube_id)):
+        seconds = min(timeit.repeat(lambda: [fn(u) for u in CORPUS], number=args.rounds, repeat=3))
+        results[name] = seconds
+        print(f"{name:>8}: {seconds / n * 1e9:8.1f} ns/url  ({n / seconds:,.0f} urls/s)")
+    print(f" speedup: {results['legacy'] / results['current']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""Load test the duration service under uvicorn with a stubbed extractor.
+
+Starts `uvicorn benchmarks.stub_app:app`, drives the selected endpoints at
+a fixed concurrency and reports req/s and p50/p95/p99 latency. Results are
+written as JSON; pass --compare with an earlier file to flag regressions.
+
+    python benchmarks/load_test.py --concurrency 32 --requests 2000 \\
+        --latency-ms 50 --error-rate 0.01 --output results.json
+"""
+
+import argparse
+import http.client
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIOS = ('get', 'post', 'batch')
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank percentile
+    rank = math.ceil(pct / 100.0 * len(sorted_values))
+    return sorted_values[min(len(sorted_values), max(1, rank)) - 1]
+
+
+def video_url(i: int) -> str:
+    return f"https://www.youtube.com/watch?v={i:011d}"
+
+
+def start_server(args) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        STUB_LATENCY_MS=str(args.latency_ms),
+        STUB_JITTER_MS=str(args.jitter_ms),
+        STUB_ERROR_RATE=str(args.error_rate),
+    )
+    cmd = [
+        sys.executable, '-m', 'uvicorn', 'benchmarks.stub_app:app',
+        '--host', args.host, '--port', str(args.port),
+        '--workers', str(args.workers), '--log-level', 'warning', '--no-access-log',
+    ]
+    proc = subprocess.Popen(cmd, cwd=SERVICE_DIR, env=env)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"uvicorn exited with status {proc.returncode}")
+        try:
+            conn = http.client.HTTPConnection(args.host, args.port, timeout=1)
+            conn.request('GET', '/health')
+            if conn.getresponse().status == 200:
+                return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.terminate()
+    raise SystemExit("uvicorn did not become healthy within 30s")
+
+
+def build_request(scenario: str, rng: random.Random, args) -> tuple:
+    # refresh=true forces an extraction so the stub latency is exercised
+    refresh = rng.random() >= args.cache_hit_ratio
+    if scenario == 'get':
+        url = video_url(rng.randrange(args.unique_ids))
+        path = f"/duration?url={url}&refresh={'true' if refresh else 'false'}"
+        return 'GET', path, None
+    if scenario == 'post':
+        body = {'url': video_url(rng.randrange(args.unique_ids)), 'refresh': refresh}
+        return 'POST', '/duration', json.dumps(body)
+    urls = [video_url(rng.randrange(args.unique_ids)) for _ in range(args.batch_size)]
+    return 'POST', '/durations', json.dumps({'urls': urls})
+
+
+def run_scenario(scenario: str, args) -> Dict:
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    lock = threading.Lock()
+    counter = iter(range(args.requests))
+
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        conn = http.client.HTTPConnection(args.host, args.port, timeout=args.timeout)
+        local_lat: List[float] = []
+        local_status: Dict[str, int] = {}
+        while True:
+            with lock:
+                if next(counter, None) is None:
+                    break
+            method, path, body = build_request(scenario, rng, args)
+            headers = {'Content-Type': 'application/json'} if body else {}
+            start = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                resp = conn.getresponse()
+                resp.read()
+                status = str(resp.status)
+            except (OSError, http.client.HTTPException) as e:
+                status = type(e).__name__
+                conn.close()
+                conn = http.client.HTTPConnection(args.host, args.port, timeout=args.timeout)
+            local_lat.append(time.perf_counter() - start)
+            local_status[status] = local_status.get(status, 0) + 1
+        conn.close()
+        with lock:
+            latencies.extend(local_lat)
+            for k, v in local_status.items():
+                statuses[k] = statuses.get(k, 0) + v
+
+    threads = [threading.Thread(target=worker, args=(args.seed + i,)) for i in range(args.concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'elapsed_s': elapsed,
+        'req_per_s': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'max_ms': (latencies[-1] if latencies else 0.0) * 1000,
+        'statuses': statuses,
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=SERVICE_DIR,
+            capture_output=True, text=True, check=True,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict, baseline_path: str, tolerance: float) -> bool:
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    ok = True
+    print(f"\nCompared with {baseline_path} (revision {baseline.get('revision')}):")
+    for scenario, cur in current['results'].items():
+        base = baseline.get('results', {}).get(scenario)
+        if base is None:
+            continue
+        for key, higher_is_better in (('req_per_s', True), ('p50_ms', False), ('p95_ms', False), ('p99_ms', False)):
+            old, new = base[key], cur[key]
+            change = (new - old) / old if old else 0.0
+            regressed = change < -tolerance if higher_is_better else change > tolerance
+            ok = ok and not regressed
+            flag = '  REGRESSION' if regressed else ''
+            print(f"  {scenario:<6} {key:<9} {old:10.1f} -> {new:10.1f} ({change:+.1%}){flag}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='comma-separated: get,post,batch')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=1000, help='requests per scenario')
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='stub extraction latency')
+    parser.add_argument('--jitter-ms', type=float, default=10.0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help='stub failure probability')
+    parser.add_argument('--unique-ids', type=int, default=1000, help='distinct videos to request')
+    parser.add_argument('--cache-hit-ratio', type=float, default=0.0,
+                        help='share of GET/POST requests allowed to use the cache')
+    parser.add_argument('--batch-size', type=int, default=20, help='URLs per /durations request')
+    parser.add_argument('--workers', type=int, default=1, help='uvicorn worker processes')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--timeout', type=float, default=60.0, help='client socket timeout')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', default='bench-results.json')
+    parser.add_argument('--compare', help='earlier results JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.10, help='allowed relative slowdown')
+    args = parser.parse_args()
+
+    scenarios = [s.strip() for s in args.scenarios.split(',') if s.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    proc = start_server(args)
+    try:
+        results = {}
+        for scenario in scenarios:
+            res = run_scenario(scenario, args)
+            results[scenario] = res
+            print(
+                f"{scenario:<6} {res['req_per_s']:9.1f} req/s  p50 {res['p50_ms']:7.1f} ms  "
+                f"p95 {res['p95_ms']:7.1f} ms  p99 {res['p99_ms']:7.1f} ms  statuses {res['statuses']}"
+            )
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+    report = {
+        'revision': git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': {k: v for k, v in vars(args).items() if k not in ('output', 'compare')},
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved {args.output}")
+
+    if args.compare and not compare(report, args.compare, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""The service app with yt-dlp replaced by a stub, for load testing.
+
+    uvicorn benchmarks.stub_app:app
+
+Stub behaviour is configured through the environment:
+- STUB_LATENCY_MS (default 50): mean artificial extraction latency.
+- STUB_JITTER_MS (default 10): uniform +/- jitter on the latency.
+- STUB_ERROR_RATE (default 0): fraction of extractions that fail.
+"""
+
+import os
+import random
+import time
+from typing import Dict
+
+# Benchmark the service, not the protections in front of upstream
+os.environ.setdefault('DURATION_FAST_PATH', '0')
+os.environ.setdefault('DURATION_UPSTREAM_RATE', '0')
+os.environ.setdefault('DURATION_BREAKER_FAILURES', '1000000000')
+
+from app import extractor  # noqa: E402
+from app.main import app  # noqa: E402,F401
+
+
+LATENCY = float(os.environ.get('STUB_LATENCY_MS', '50')) / 1000.0
+JITTER = float(os.environ.get('STUB_JITTER_MS', '10')) / 1000.0
+ERROR_RATE = float(os.environ.get('STUB_ERROR_RATE', '0'))
+
+
+def _stub_extract(url: str) -> Dict:
+    time.sleep(max(0.0, LATENCY + random.uniform(-JITTER, JITTER)))
+    if random.random() < ERROR_RATE:
+        raise extractor.ExtractionError("stub: injected failure")
+    vid = extractor.extract_youtube_id(url) or 'unknown'
+    duration = 60 + sum(map(ord, vid)) % 3600
+    return {
+        'id': vid,
+        'title': f'Stub video {vid}',
+        'duration_seconds': duration,
+        'duration_human': extractor.seconds_to_hms(duration),
+        'source': 'stub',
+    }
+
+
+extractor._extract_with_ytdlp = _stub_extract
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Run from anywhere: make the service's `app` package and tools/ importable
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'tools'))
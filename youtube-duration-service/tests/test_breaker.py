@@ -0,0 +1,115 @@
+"""The circuit breaker opens on upstream failures only, never on bad video IDs."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import extractor
+from app.main import app
+from app.resilience import CircuitBreaker, TokenBucket
+from app.ytdl_pool import YoutubeDLPool
+from stub_watch_server import start_stub_server
+
+
+THRESHOLD = 3
+
+
+class FakeExtractorError(Exception):
+    """Shaped like yt-dlp's ExtractorError for an unavailable video."""
+
+    def __init__(self, msg):
+        super().__init__(msg)
+        self.expected = True
+
+
+class FakeTransportError(Exception):
+    pass
+
+
+FakeTransportError.__name__ = 'TransportError'
+
+
+@pytest.fixture
+def client(monkeypatch):
+    stub = start_stub_server()
+    monkeypatch.setattr(extractor, 'WATCH_BASE_URL', f'http://127.0.0.1:{stub.server_port}')
+    monkeypatch.setattr(extractor, 'breaker', CircuitBreaker(failure_threshold=THRESHOLD, cooldown=30))
+    monkeypatch.setattr(extractor, 'rate_limiter', TokenBucket(rate=0, burst=0))
+    extractor.cache.clear()
+    try:
+        with TestClient(app) as c:
+            yield c
+    finally:
+        stub.shutdown()
+        extractor.cache.clear()
+
+
+def _fail_ytdlp(monkeypatch, error):
+    def extract(url):
+        raise error
+
+    monkeypatch.setattr(extractor.ydl_pool, 'started', False)
+    monkeypatch.setattr(extractor, '_extract_with_fresh_ytdlp', extract)
+
+
+def test_invalid_ids_do_not_open_breaker(client, monkeypatch):
+    _fail_ytdlp(monkeypatch, FakeExtractorError("[youtube] bogus: Video unavailable"))
+    for i in range(THRESHOLD * 3):
+        r = client.get('/duration', params={'url': f'https://www.youtube.com/watch?v=bogus{i}'})
+        assert r.status_code == 400
+        r = client.get('/duration', params={'url': f'https://youtu.be/priv{i:07d}'})
+        assert r.status_code == 400
+    assert extractor.breaker.state == CircuitBreaker.CLOSED
+
+    # A valid video still resolves from its watch page
+    r = client.get('/duration', params={'url': 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'})
+    assert r.status_code == 200
+    assert r.json()['duration_seconds'] > 0
+
+
+def test_unclassified_errors_do_not_open_breaker(client, monkeypatch):
+    # e.g. yt-dlp missing: the watch page 404 and the fallback say nothing about upstream health
+    _fail_ytdlp(monkeypatch, extractor.ExtractionError("yt-dlp not available"))
+    for i in range(THRESHOLD * 2):
+        assert client.get('/duration', params={'url': f'https://youtu.be/none{i:07d}'}).status_code == 400
+    assert extractor.breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.parametrize('error', [
+    FakeTransportError("Connection reset by peer"),
+    Exception("Unable to download webpage: HTTP Error 429: Too Many Requests"),
+    TimeoutError("The read operation timed out"),
+])
+def test_upstream_failures_open_breaker(client, monkeypatch, error):
+    # Connection refused for the watch page, then yt-dlp fails upstream too
+    monkeypatch.setattr(extractor, 'WATCH_BASE_URL', 'http://127.0.0.1:9')
+    _fail_ytdlp(monkeypatch, error)
+    for i in range(THRESHOLD):
+        r = client.get('/duration', params={'url': f'https://youtu.be/down{i:07d}'})
+        assert r.status_code == 502
+    assert extractor.breaker.state == CircuitBreaker.OPEN
+
+    r = client.get('/duration', params={'url': 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'})
+    assert r.status_code == 503
+
+
+def test_watch_page_outage_counts_when_fallback_is_inconclusive(client, monkeypatch):
+    monkeypatch.setattr(extractor, 'WATCH_BASE_URL', 'http://127.0.0.1:9')
+    _fail_ytdlp(monkeypatch, extractor.ExtractionError("yt-dlp not available"))
+    for i in range(THRESHOLD):
+        client.get('/duration', params={'url': f'https://youtu.be/down{i:07d}'})
+    assert extractor.breaker.state == CircuitBreaker.OPEN
+
+
+def test_pool_exhaustion_is_not_an_upstream_failure(client, monkeypatch):
+    # Every YoutubeDL instance is checked out: a local bottleneck, even with the watch page down
+    monkeypatch.setattr(extractor, 'WATCH_BASE_URL', 'http://127.0.0.1:9')
+    monkeypatch.setattr(extractor, 'POOL_CHECKOUT_TIMEOUT', 0.01)
+    pool = YoutubeDLPool(size=1, factory=object)
+    pool.start()
+    monkeypatch.setattr(extractor, 'ydl_pool', pool)
+    with pool.checkout():
+        for i in range(THRESHOLD * 2):
+            r = client.get('/duration', params={'url': f'https://youtu.be/busy{i:07d}'})
+            assert r.status_code == 503
+            assert 'Retry-After' in r.headers
+    assert extractor.breaker.state == CircuitBreaker.CLOSED
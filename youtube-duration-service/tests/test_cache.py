@@ -0,0 +1,39 @@
+"""The SQLite tier keeps expired rows for the stale grace period only."""
+
+import time
+
+from app.cache import SQLiteCache
+
+
+def _rows(cache):
+    return cache._conn.execute("SELECT COUNT(*) FROM durations").fetchone()[0]
+
+
+def test_expired_rows_are_served_stale_then_pruned(tmp_path):
+    cache = SQLiteCache(str(tmp_path / 'durations.db'), ttl=60, stale_grace=60, prune_interval=0)
+    cache.set('old', {'id': 'old'}, ttl=-30)
+    cache.set('gone', {'id': 'gone'}, ttl=-120)
+    cache.set('new', {'id': 'new'})
+
+    assert cache.get('old') is None
+    assert cache.get('old', allow_expired=True) == {'id': 'old'}
+    assert cache.get('gone', allow_expired=True) is None
+    assert cache.get('new') == {'id': 'new'}
+    assert _rows(cache) == 2
+
+
+def test_prune_runs_at_most_every_interval(tmp_path):
+    cache = SQLiteCache(str(tmp_path / 'durations.db'), ttl=60, stale_grace=0, prune_interval=3600)
+    cache.set('first', {})  # the first set prunes; later ones wait for the interval
+    for i in range(100):
+        cache.set(f'expired{i}', {}, ttl=-1)
+    assert _rows(cache) == 101
+
+    assert cache.prune() == 100
+    assert _rows(cache) == 1
+    cache.set('expired', {}, ttl=-1)
+    assert _rows(cache) == 2
+    cache._last_prune = time.time() - 3600
+    cache.set('fresh', {})
+    assert _rows(cache) == 2
+    assert cache.get('fresh') == {}
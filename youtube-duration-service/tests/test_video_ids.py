@@ -0,0 +1,34 @@
+"""Only ids the URL plainly names are used as cache and single-flight keys."""
+
+import pytest
+
+from app import extractor
+
+
+@pytest.mark.parametrize('url, guessed', [
+    ('https://www.youtube.com/attribution_link?a=x&u=%2Fwatch%3Fv%3DdQw4w9WgXcQ', 'attribution'),
+    ('https://www.youtube.com/user/SomeChannelName', 'SomeChannel'),
+])
+def test_guessed_ids_are_not_keys(url, guessed):
+    assert extractor.extract_youtube_id(url) == guessed
+    assert extractor.extract_youtube_id(url, guess=False) is None
+
+
+def test_unkeyed_urls_skip_the_cache_and_store_under_the_real_id(monkeypatch):
+    calls = []
+
+    def resolve(url, video_id):
+        calls.append((url, video_id))
+        return {'id': 'dQw4w9WgXcQ', 'title': '', 'duration_seconds': 212, 'duration_human': '00:03:32'}
+
+    monkeypatch.setattr(extractor, '_resolve_guarded', resolve)
+    extractor.cache.clear()
+    # Poisoned entry under the guessed id: must never be served
+    extractor.cache.set('attribution', {'id': 'attribution', 'duration_seconds': 1})
+    try:
+        url = 'https://www.youtube.com/attribution_link?a=x&u=%2Fwatch%3Fv%3DdQw4w9WgXcQ'
+        assert extractor.get_duration_info(url)['duration_seconds'] == 212
+        assert calls == [(url, None)]
+        assert extractor.cache.get('dQw4w9WgXcQ')['duration_seconds'] == 212
+    finally:
+        extractor.cache.clear()
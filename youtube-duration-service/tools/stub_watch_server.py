@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Serve recorded watch-page HTML fixtures for the fast extraction path.
+
+Requests for /watch?v=<id> are answered with fixtures/watch/<id>.html, or
+404 when no fixture exists. Point the service at it with:
+
+    python tools/stub_watch_server.py --port 8765
+    DURATION_WATCH_BASE_URL=http://127.0.0.1:8765 uvicorn app.main:app
+"""
+
+import argparse
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'watch')
+
+
+def make_handler(fixture_dir: str):
+    class WatchPageHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            video_id = (parse_qs(parsed.query).get('v') or [''])[0]
+            path = os.path.join(fixture_dir, f'{os.path.basename(video_id)}.html')
+            if parsed.path != '/watch' or not video_id or not os.path.isfile(path):
+                self.send_error(404)
+                return
+            with open(path, 'rb') as f:
+                body = f.read()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return WatchPageHandler
+
+
+def start_stub_server(port: int = 0, fixture_dir: Optional[str] = None) -> ThreadingHTTPServer:
+    """Start the stub server on a background thread; port 0 picks a free port."""
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(fixture_dir or FIXTURE_DIR))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--fixtures', default=FIXTURE_DIR)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), make_handler(args.fixtures))
+    print(f"Serving {args.fixtures} on http://127.0.0.1:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    server.server_close()
+
+
+if __name__ == '__main__':
+    main()